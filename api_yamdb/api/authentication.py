@@ -0,0 +1,16 @@
+"""Аутентификация подзапросов ``BatchView``."""
+from rest_framework.authentication import BaseAuthentication
+
+# Атрибут HttpRequest подзапроса с парой (пользователь, токен).
+BATCH_AUTH_ATTR = 'batch_auth'
+
+
+class SubrequestAuthentication(BaseAuthentication):
+    """Пользователь, уже определённый для внешнего запроса ``BatchView``.
+
+    Атрибут с пользователем есть только у подзапросов, собранных внутри
+    процесса, поэтому клиент не может его передать.
+    """
+
+    def authenticate(self, request):
+        return getattr(request, BATCH_AUTH_ATTR, None)
@@ -0,0 +1,111 @@
+"""Общий для процессов вектор версий коллекций.
+
+Версии хранятся в файле, отображённом в память: каждой коллекции
+соответствует 8-байтовая ячейка. Чтение — распаковка числа из памяти без
+системных вызовов, запись выполняется под блокировкой файла. Процессы
+проверяют вектор в начале запроса и сбрасывают устаревшие данные в памяти
+через подписчиков ``subscribe``.
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+SLOT = struct.Struct('<q')
+
+
+class VersionBus:
+
+    def __init__(self, scopes):
+        self.slots = {scope: index for index, scope in enumerate(scopes)}
+        self.size = SLOT.size * len(scopes)
+        self.memory = None
+        self.pid = None
+        self.lock = threading.Lock()
+        self.seen = {}
+        self.listeners = {}
+
+    def open(self):
+        # После fork отображение открывается заново в каждом процессе.
+        if self.memory is not None and self.pid == os.getpid():
+            return self.memory
+        with self.lock:
+            if self.memory is None or self.pid != os.getpid():
+                fd = os.open(settings.VERSION_BUS_PATH,
+                             os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    if os.fstat(fd).st_size < self.size:
+                        os.ftruncate(fd, self.size)
+                    self.memory = mmap.mmap(fd, self.size)
+                finally:
+                    os.close(fd)
+                self.pid = os.getpid()
+        return self.memory
+
+    def __contains__(self, scope):
+        return scope in self.slots
+
+    def read(self, scope):
+        return SLOT.unpack_from(self.open(), self.slots[scope] * SLOT.size)[0]
+
+    def bump(self, *scopes):
+        """Повышает версии коллекций.
+
+        Возвращает пары ``(прежняя, новая)``: прежнее значение прочитано
+        под той же блокировкой, поэтому по нему видно, не повысил ли
+        версию другой процесс.
+        """
+        memory = self.open()
+        now = time.time_ns() // 1000
+        with self.lock, FileLock(settings.VERSION_BUS_PATH):
+            versions = []
+            for scope in scopes:
+                offset = self.slots[scope] * SLOT.size
+                previous = SLOT.unpack_from(memory, offset)[0]
+                version = max(now, previous + 1)
+                SLOT.pack_into(memory, offset, version)
+                versions.append((previous, version))
+        return versions
+
+    def subscribe(self, scope, callback):
+        """``callback(version)`` вызывается ``sync``, когда версия
+        изменилась."""
+        self.listeners.setdefault(scope, []).append(callback)
+
+    def sync(self):
+        """Сбрасывает данные в памяти, устаревшие после записей в других
+        процессах."""
+        for scope, callbacks in self.listeners.items():
+            version = self.read(scope)
+            if self.seen.get(scope) != version:
+                self.seen[scope] = version
+                for callback in callbacks:
+                    callback(version)
+
+
+class FileLock:
+    """Эксклюзивная блокировка файла на время записи в вектор."""
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self.fd = os.open(self.path, os.O_RDWR)
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
@@ -0,0 +1,184 @@
+"""Бэкенд кеша в отдельном файле SQLite, общий для процессов.
+
+Версии коллекций, фрагменты и блокировки заполнения должны быть видны
+всем процессам сервера, а ``LocMemCache`` у каждого процесса свой.
+Кеш хранится в собственном файле в режиме WAL и не занимает блокировку
+записи основной базы. ``add`` выполняется одним ``INSERT … ON CONFLICT``
+и поэтому атомарен между процессами. Для нескольких машин по-прежнему
+нужен Memcached или Redis.
+
+Пример настройки::
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'api.cache.SQLiteCache',
+            'LOCATION': BASE_DIR / 'cache.sqlite3',
+        }
+    }
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Ограничение числа параметров одного запроса SQLite.
+CHUNK = 500
+# Устаревшие записи удаляются раз в ``CULL_EVERY`` записей.
+CULL_EVERY = 100
+BUSY_TIMEOUT = 5
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache ('
+    'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL'
+    ') WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)',
+)
+UPSERT = (
+    'INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) '
+    'ON CONFLICT (key) DO UPDATE SET '
+    'value = excluded.value, expires = excluded.expires'
+)
+
+
+def chunks(items):
+    items = list(items)
+    for start in range(0, len(items), CHUNK):
+        yield items[start:start + CHUNK]
+
+
+class SQLiteCache(BaseCache):
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.location = str(location)
+        self.local = threading.local()
+
+    @property
+    def connection(self):
+        # Соединение своё у каждого потока и заново открывается после fork.
+        local = self.local
+        if getattr(local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(
+                self.location, timeout=BUSY_TIMEOUT, isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            for statement in SCHEMA:
+                connection.execute(statement)
+            local.connection, local.pid, local.writes = (
+                connection, os.getpid(), 0
+            )
+        return local.connection
+
+    def write(self, sql, rows):
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = connection.executemany(sql, rows)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        self.local.writes += 1
+        if self.local.writes % CULL_EVERY == 0:
+            self._cull()
+        return cursor.rowcount
+
+    def _cull(self):
+        connection = self.connection
+        connection.execute(
+            'DELETE FROM cache WHERE expires <= ?', (time.time(),)
+        )
+        (count,) = connection.execute('SELECT COUNT(*) FROM cache').fetchone()
+        if count > self._max_entries:
+            # Бессрочные записи (версии) удаляются последними: пропавшая
+            # версия создаётся заново текущим временем и не убывает.
+            connection.execute(
+                'DELETE FROM cache WHERE key IN (SELECT key FROM cache '
+                'ORDER BY expires IS NULL, expires LIMIT ?)',
+                (count // self._cull_frequency
+                 if self._cull_frequency else count,),
+            )
+
+    def _key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version=version).get(key, default)
+
+    def get_many(self, keys, version=None):
+        keys = {self._key(key, version): key for key in keys}
+        now = time.time()
+        result = {}
+        for chunk in chunks(keys):
+            rows = self.connection.execute(
+                'SELECT key, value, expires FROM cache WHERE key IN '
+                f'({", ".join("?" * len(chunk))})', chunk,
+            )
+            result.update(
+                (keys[key], pickle.loads(value))
+                for key, value, expires in rows
+                if expires is None or expires > now
+            )
+        return result
+
+    def has_key(self, key, version=None):
+        return key in self.get_many([key], version=version)
+
+    def _row(self, key, value, timeout, version):
+        return (
+            self._key(key, version),
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+            self.get_backend_timeout(timeout),
+        )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        row = self._row(key, value, timeout, version)
+        return self.write(
+            f'{UPSERT} WHERE cache.expires <= ?', [(*row, time.time())]
+        ) > 0
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        if data:
+            self.write(UPSERT, [
+                self._row(key, value, timeout, version)
+                for key, value in data.items()
+            ])
+        return []
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.write(
+            'UPDATE cache SET expires = ? WHERE key = ? '
+            'AND (expires IS NULL OR expires > ?)',
+            [(self.get_backend_timeout(timeout), self._key(key, version),
+              time.time())],
+        ) > 0
+
+    def delete(self, key, version=None):
+        return self.delete_many([key], version=version) > 0
+
+    def delete_many(self, keys, version=None):
+        keys = [self._key(key, version) for key in keys]
+        deleted = 0
+        for chunk in chunks(keys):
+            deleted += self.write(
+                'DELETE FROM cache WHERE key IN '
+                f'({", ".join("?" * len(chunk))})', [chunk],
+            )
+        return deleted
+
+    def clear(self):
+        self.write('DELETE FROM cache', [()])
+
+    def close(self, **kwargs):
+        # Соединение живёт вместе с потоком, как у соединений Django.
+        pass
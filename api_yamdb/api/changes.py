@@ -0,0 +1,87 @@
+"""Изменения из журнала ``ChangeLog`` для синхронизации клиентов."""
+from api.row_serializers import (CatalogRowSerializer,
+                                 ReviewCommentRowSerializer,
+                                 ReviewRowSerializer, TitleRowSerializer)
+from reviews.models import (Category, ChangeLog, Genre, Review, ReviewComment,
+                            Title)
+
+# Модель журнала: (QuerySet, сериализатор строк, ключи родителей).
+SOURCES = {
+    'title': (
+        lambda: Title.objects.with_rating(),
+        TitleRowSerializer, (),
+    ),
+    'review': (
+        lambda: Review.objects.all(), ReviewRowSerializer, ('title_id',),
+    ),
+    'comment': (
+        lambda: ReviewComment.objects.all(), ReviewCommentRowSerializer,
+        ('review_id', 'review__title_id'),
+    ),
+    'genre': (lambda: Genre.objects.all(), CatalogRowSerializer, ()),
+    'category': (lambda: Category.objects.all(), CatalogRowSerializer, ()),
+}
+
+
+def load_objects(model, ids):
+    """Текущие представления объектов ``{id: данные}``."""
+    queryset, serializer_class, parents = SOURCES[model]
+    serializer = serializer_class()
+    rows = list(serializer.values(
+        queryset().filter(pk__in=ids), ('id', *parents)
+    ))
+    data = {}
+    for row, item in zip(rows, serializer.serialize(rows)):
+        for column in parents:
+            item[column.rpartition('__')[2]] = row[column]
+        data[row['id']] = item
+    return data
+
+
+def get_changes(since, limit):
+    """Изменения после курсора ``since`` и признак продолжения.
+
+    Из нескольких записей об одном объекте на странице остаётся последняя.
+    Данные созданных и изменённых объектов читаются по одному запросу на
+    модель; у удалённых ``data`` равно ``None``. Объект, который уже не
+    виден, например скрытый мягким удалением, отдаётся как удалённый.
+    """
+    entries = list(
+        ChangeLog.objects.filter(id__gt=since)
+        .order_by('id')
+        .values_list('id', 'model', 'object_id', 'action')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    latest = {
+        (model, object_id): (cursor, action)
+        for cursor, model, object_id, action in entries
+    }
+    ids = {}
+    for (model, object_id), (_, action) in latest.items():
+        if action != ChangeLog.DELETED:
+            ids.setdefault(model, []).append(object_id)
+    objects = {
+        model: load_objects(model, model_ids)
+        for model, model_ids in ids.items()
+    }
+    changes = sorted(
+        (cursor, model, object_id,
+         action if object_id in objects.get(model, {})
+         else ChangeLog.DELETED)
+        for (model, object_id), (cursor, action) in latest.items()
+    )
+    return {
+        'next': entries[-1][0] if entries else since,
+        'has_more': has_more,
+        'results': [
+            {
+                'cursor': cursor,
+                'model': model,
+                'id': object_id,
+                'action': action,
+                'data': objects.get(model, {}).get(object_id),
+            }
+            for cursor, model, object_id, action in changes
+        ],
+    }
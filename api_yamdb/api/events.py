@@ -0,0 +1,167 @@
+"""Поток новых отзывов и комментариев произведения (Server-Sent Events).
+
+Поток отдаёт ASGI-приложение ``EventStreamApp`` по адресу
+``/api/v1/titles/<id>/events/``, остальные запросы передаются Django.
+События публикует ``broker`` из обработчиков создания отзывов и
+комментариев после фиксации транзакции. Подписчики живут в памяти
+процесса: событие получают клиенты, подключённые к тому же процессу.
+"""
+import asyncio
+import json
+import re
+import threading
+
+from asgiref.sync import sync_to_async
+
+from reviews.models import Title
+
+KEEPALIVE_INTERVAL = 15
+QUEUE_SIZE = 100
+PATH = re.compile(r'^/api/v1/titles/(?P<title_id>\d+)/events/$')
+
+
+def format_event(event, event_id, data):
+    payload = json.dumps(data, ensure_ascii=False)
+    return f'event: {event}\nid: {event_id}\ndata: {payload}\n\n'.encode()
+
+
+class EventBroker:
+    """Подписки на события произведений.
+
+    Каждый подписчик — очередь ``asyncio`` в цикле событий, где она
+    создана. ``publish`` можно вызывать из любого потока: событие
+    передаётся в цикл подписчика через ``call_soon_threadsafe``. Если
+    клиент не успевает читать, самые старые события отбрасываются.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = {}
+
+    def subscribe(self, title_id):
+        queue = asyncio.Queue(QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            self.subscribers.setdefault(title_id, set()).add((loop, queue))
+        return queue
+
+    def unsubscribe(self, title_id, queue):
+        with self.lock:
+            subscribers = self.subscribers.get(title_id, set())
+            subscribers.difference_update(
+                item for item in list(subscribers) if item[1] is queue
+            )
+            if not subscribers:
+                self.subscribers.pop(title_id, None)
+
+    def has_subscribers(self, title_id):
+        return title_id in self.subscribers
+
+    def publish(self, title_id, event, event_id, data):
+        with self.lock:
+            subscribers = list(self.subscribers.get(title_id, ()))
+        if not subscribers:
+            return
+        message = format_event(event, event_id, data)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, message)
+            except RuntimeError:
+                # Цикл подписчика уже закрыт.
+                self.unsubscribe(title_id, queue)
+
+    @staticmethod
+    def _put(queue, message):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+broker = EventBroker()
+
+
+class EventStreamApp:
+    """ASGI-приложение, отдающее поток событий произведения."""
+
+    headers = [
+        (b'content-type', b'text/event-stream; charset=utf-8'),
+        (b'cache-control', b'no-cache'),
+        (b'x-accel-buffering', b'no'),
+    ]
+
+    def __init__(self, application, broker=broker):
+        self.application = application
+        self.broker = broker
+
+    async def __call__(self, scope, receive, send):
+        match = (
+            PATH.match(scope['path'])
+            if scope['type'] == 'http' and scope['method'] == 'GET'
+            else None
+        )
+        if match is None:
+            return await self.application(scope, receive, send)
+        title_id = int(match['title_id'])
+        if not await self.title_exists(title_id):
+            return await self.send_not_found(send)
+        await self.stream(title_id, receive, send)
+
+    @staticmethod
+    @sync_to_async
+    def title_exists(title_id):
+        return Title.objects.filter(pk=title_id).exists()
+
+    async def send_not_found(self, send):
+        body = json.dumps(
+            {'detail': 'Страница не найдена.'}, ensure_ascii=False
+        ).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': 404,
+            'headers': [(b'content-type', b'application/json')],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def stream(self, title_id, receive, send):
+        queue = self.broker.subscribe(title_id)
+        disconnect = asyncio.ensure_future(self.wait_disconnect(receive))
+        message = None
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': self.headers,
+            })
+            await send({
+                'type': 'http.response.body',
+                'body': b': connected\n\n',
+                'more_body': True,
+            })
+            message = asyncio.ensure_future(queue.get())
+            while True:
+                done, _ = await asyncio.wait(
+                    {message, disconnect}, timeout=KEEPALIVE_INTERVAL,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnect in done:
+                    break
+                if message in done:
+                    body = message.result()
+                    message = asyncio.ensure_future(queue.get())
+                else:
+                    body = b': keepalive\n\n'
+                await send({
+                    'type': 'http.response.body',
+                    'body': body,
+                    'more_body': True,
+                })
+        finally:
+            self.broker.unsubscribe(title_id, queue)
+            for task in (message, disconnect):
+                if task is not None:
+                    task.cancel()
+
+    @staticmethod
+    async def wait_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
@@ -0,0 +1,276 @@
+"""Битовые индексы произведений для фасетной фильтрации.
+
+Каждому жанру, категории и году соответствует целое число, в котором
+бит с номером ``id`` установлен для каждого подходящего произведения.
+Фильтры вычисляются пересечением и объединением таких чисел, а из базы
+загружается только нужная страница.
+"""
+import threading
+from functools import reduce
+from itertools import islice
+from operator import and_, or_
+
+from django.db import transaction
+
+from api import snapshots
+from api.versions import FACETS, bus, get_version
+from reviews.models import GenreTitle, Title
+
+
+def bitmap_from_ids(ids):
+    bitmap = 0
+    for pk in ids:
+        bitmap |= 1 << pk
+    return bitmap
+
+
+def bit_count(bitmap):
+    return bin(bitmap).count('1')
+
+
+def iter_ids(bitmap):
+    """Номера установленных битов в порядке возрастания."""
+    bits = bin(bitmap)
+    lowest = len(bits) - 1
+    end = len(bits)
+    while True:
+        end = bits.rfind('1', 2, end)
+        if end < 0:
+            return
+        yield lowest - end
+
+
+class FacetIndex:
+    """Индекс произведений по жанрам, категориям и годам.
+
+    Строится из базы при первом обращении и после изменения версии
+    ``FACETS`` в другом процессе. Изменения в текущем процессе
+    применяются к индексу по одному произведению.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = None
+        bus.subscribe(FACETS, self.clear)
+
+    def clear(self, version):
+        with self.lock:
+            if self.version == version:
+                return
+            self.version = None
+            self.genres, self.categories, self.years = {}, {}, {}
+            self.titles = {}
+
+    def build(self):
+        version = get_version(FACETS)
+        genres, categories, years, titles = {}, {}, {}, {}
+        for pk, category_id, year in Title.objects.values_list(
+                'id', 'category_id', 'year'):
+            titles[pk] = (category_id, year)
+            bit = 1 << pk
+            if category_id is not None:
+                categories[category_id] = categories.get(category_id, 0) | bit
+            years[year] = years.get(year, 0) | bit
+        for title_id, genre_id in GenreTitle.objects.values_list(
+                'title_id', 'genre_id'):
+            genres[genre_id] = genres.get(genre_id, 0) | 1 << title_id
+        self.genres, self.categories, self.years = genres, categories, years
+        self.titles = titles
+        self.version = version
+
+    def ensure_fresh(self):
+        with self.lock:
+            if self.version != get_version(FACETS):
+                self.build()
+
+    def _apply(self, change):
+        """Повышает версию и применяет изменение к актуальному индексу.
+
+        Индекс актуален, если прежняя версия, прочитанная под блокировкой
+        вектора, совпадает с его версией. Иначе между проверкой и записью
+        версию повысил другой процесс, и индекс перестроится при чтении.
+        """
+        with self.lock:
+            ((previous, version),) = bus.bump(FACETS)
+            if previous == self.version:
+                change()
+                self.version = version
+
+    def on_commit(self, change):
+        transaction.on_commit(lambda: self._apply(change))
+
+    def _clear_title(self, pk):
+        bit = 1 << pk
+        category_id, year = self.titles.pop(pk, (None, None))
+        if category_id in self.categories:
+            self.categories[category_id] &= ~bit
+        if year in self.years:
+            self.years[year] &= ~bit
+
+    def title_saved(self, pk, category_id, year):
+        def change():
+            self._clear_title(pk)
+            bit = 1 << pk
+            self.titles[pk] = (category_id, year)
+            if category_id is not None:
+                self.categories[category_id] = (
+                    self.categories.get(category_id, 0) | bit
+                )
+            self.years[year] = self.years.get(year, 0) | bit
+        self.on_commit(change)
+
+    def title_deleted(self, pk):
+        def change():
+            self._clear_title(pk)
+            for genre_id in self.genres:
+                self.genres[genre_id] &= ~(1 << pk)
+        self.on_commit(change)
+
+    def genres_added(self, title_id, genre_ids):
+        def change():
+            for genre_id in genre_ids:
+                self.genres[genre_id] = (
+                    self.genres.get(genre_id, 0) | 1 << title_id
+                )
+        self.on_commit(change)
+
+    def genres_removed(self, title_id, genre_ids=None):
+        def change():
+            for genre_id in (self.genres if genre_ids is None else genre_ids):
+                if genre_id in self.genres:
+                    self.genres[genre_id] &= ~(1 << title_id)
+        self.on_commit(change)
+
+    def category_deleted(self, category_id):
+        def change():
+            bitmap = self.categories.pop(category_id, 0)
+            for pk in iter_ids(bitmap):
+                self.titles[pk] = (None, self.titles[pk][1])
+        self.on_commit(change)
+
+    def genre_deleted(self, genre_id):
+        self.on_commit(lambda: self.genres.pop(genre_id, None))
+
+    def select(self, genres=None, genres_all=None, categories=None,
+               years=None, year_min=None, year_max=None):
+        """Битовая маска произведений, подходящих под все условия.
+
+        ``genres`` и ``categories`` — списки slug, из которых подходит любой,
+        ``genres_all`` — slug, которые должны быть у произведения все.
+        ``None`` означает отсутствие условия.
+        """
+        self.ensure_fresh()
+        with self.lock:
+            conditions = []
+            if genres is not None:
+                conditions.append(self._any(self.genres, snapshots.genres,
+                                            genres))
+            if genres_all is not None:
+                conditions.append(self._all(self.genres, snapshots.genres,
+                                            genres_all))
+            if categories is not None:
+                conditions.append(self._any(
+                    self.categories, snapshots.categories, categories
+                ))
+            if years is not None or year_min is not None or (
+                    year_max is not None):
+                conditions.append(self._years(years, year_min, year_max))
+            if not conditions:
+                return reduce(or_, self.years.values(), 0)
+            return reduce(and_, conditions)
+
+    def counts(self, selection, restrict=None):
+        """Число произведений для каждого жанра, категории и года.
+
+        Подсчёт дизъюнктивный: для значений измерения не учитывается
+        условие этого же измерения, то есть счётчик значения равен числу
+        произведений, которые подошли бы, если выбрать в измерении только
+        его. ``restrict`` — дополнительная битовая маска, например
+        совпадения по названию.
+        """
+        def base(*excluded):
+            bitmap = self.select(**{
+                key: value for key, value in selection.items()
+                if key not in excluded
+            })
+            return bitmap if restrict is None else bitmap & restrict
+
+        with self.lock:
+            years = base('years', 'year_min', 'year_max')
+            return {
+                'count': bit_count(base()),
+                'genre': self._counts(
+                    self.genres, snapshots.genres, base('genres')
+                ),
+                'category': self._counts(
+                    self.categories, snapshots.categories, base('categories')
+                ),
+                'year': [
+                    {'year': year, 'count': count}
+                    for year, count in sorted(
+                        (year, bit_count(years & bitmap))
+                        for year, bitmap in self.years.items()
+                    )
+                    if count
+                ],
+            }
+
+    def _counts(self, bitmaps, snapshot, base):
+        return [
+            dict(item, count=bit_count(
+                base & bitmaps.get(snapshot.get_id(item['slug']), 0)
+            ))
+            for item in snapshot.items()
+        ]
+
+    def _any(self, bitmaps, snapshot, slugs):
+        ids = (snapshot.get_id(slug) for slug in slugs)
+        return reduce(or_, (bitmaps.get(pk, 0) for pk in ids), 0)
+
+    def _all(self, bitmaps, snapshot, slugs):
+        return reduce(
+            and_, (self._any(bitmaps, snapshot, [slug]) for slug in slugs)
+        )
+
+    def _years(self, years, year_min, year_max):
+        return reduce(or_, (
+            bitmap for year, bitmap in self.years.items()
+            if (years is None or year in years)
+            and (year_min is None or year >= year_min)
+            and (year_max is None or year <= year_max)
+        ), 0)
+
+
+class IndexedQuerySet:
+    """Обёртка над QuerySet, ограниченная произведениями из битовой маски.
+
+    Подсчёт выполняется по маске, а из базы загружаются только строки
+    запрошенного среза. Порядок строк — по возрастанию ``id``.
+    """
+
+    ordered = True
+
+    def __init__(self, queryset, bitmap):
+        self.queryset = queryset
+        self.bitmap = bitmap
+
+    def values(self, *fields):
+        return IndexedQuerySet(self.queryset.values(*fields), self.bitmap)
+
+    def count(self):
+        return bit_count(self.bitmap)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        ids = list(islice(iter_ids(self.bitmap), index.start, index.stop))
+        return list(self.queryset.filter(pk__in=ids).order_by('pk'))
+
+    def __iter__(self):
+        return iter(self[:])
+
+
+index = FacetIndex()
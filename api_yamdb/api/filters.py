@@ -1,13 +1,72 @@
 from django_filters.rest_framework import CharFilter, FilterSet
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
 
+from api import facets
 from reviews.models import Title
 
 
 class FilterTitle(FilterSet):
     name = CharFilter(field_name='name', lookup_expr='icontains')
-    genre = CharFilter(field_name='genre__slug')
-    category = CharFilter(field_name='category__slug')
 
     class Meta:
         model = Title
-        fields = ('name', 'genre', 'category', 'year')
+        fields = ('name',)
+
+
+class FacetFilterBackend(BaseFilterBackend):
+    """Фильтрует список произведений по битовому индексу ``api.facets``.
+
+    Параметры: ``genre`` и ``category`` — slug через запятую, подходит
+    любой из них; ``genre_all`` — slug жанров, которые должны быть у
+    произведения все; ``year``, ``year_min`` и ``year_max`` — год выпуска
+    или границы диапазона включительно.
+    """
+
+    def get_facet_params(self, request):
+        params = request.query_params
+        selection = {}
+        for param, key in (('genre', 'genres'), ('genre_all', 'genres_all'),
+                           ('category', 'categories')):
+            slugs = [slug for slug in params.get(param, '').split(',') if slug]
+            if slugs:
+                selection[key] = slugs
+        for param, key in (('year', 'years'), ('year_min', 'year_min'),
+                           ('year_max', 'year_max')):
+            if params.get(param):
+                try:
+                    year = int(params[param])
+                except ValueError:
+                    raise ValidationError({param: ['Введите целое число.']})
+                selection[key] = [year] if key == 'years' else year
+        return selection
+
+    def get_restriction(self, queryset):
+        """Маска произведений, отобранных фильтрами на стороне базы.
+
+        Условие менеджера, скрывающее удалённые произведения, не считается:
+        их нет и в индексе фасетов.
+        """
+        base = queryset.model._default_manager.all().query.where
+        if len(queryset.query.where.children) <= len(base.children):
+            return None
+        return facets.bitmap_from_ids(
+            queryset.order_by().values_list('id', flat=True)
+        )
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, 'action', None) != 'list':
+            return queryset
+        selection = self.get_facet_params(request)
+        if not selection:
+            return queryset
+        bitmap = facets.index.select(**selection)
+        restrict = self.get_restriction(queryset)
+        if restrict is not None:
+            bitmap &= restrict
+        return facets.IndexedQuerySet(queryset, bitmap)
+
+    def facet_counts(self, request, queryset):
+        return facets.index.counts(
+            self.get_facet_params(request), self.get_restriction(queryset)
+        )
@@ -0,0 +1,37 @@
+"""Кеш сериализованных объектов для списков.
+
+Представление объекта хранится в кеше под ключом из модели, ``pk``,
+версии объекта и версий общих коллекций, от которых оно зависит
+(например, имён пользователей). Изменение объекта повышает его версию
+после фиксации транзакции, поэтому старые записи просто перестают
+читаться.
+"""
+from api import singleflight
+from api.versions import bump_on_commit, get_versions, object_scope
+
+FRAGMENT_KEY = 'fragment:{}:{}:{}'
+FRAGMENT_TIMEOUT = 24 * 60 * 60
+
+
+def get_fragments(model, ids, shared_scopes, serialize):
+    """Словарь ``{pk: представление}`` для объектов ``ids``.
+
+    ``serialize(missing)`` возвращает такой же словарь для объектов,
+    которых нет в кеше; каждый объект сериализует только один запрос.
+    Удалённых объектов в результате нет.
+    """
+    scopes = [object_scope(model, pk) for pk in ids]
+    versions = get_versions(*shared_scopes, *scopes)
+    shared = '.'.join(map(str, versions[:len(shared_scopes)]))
+    keys = {
+        pk: FRAGMENT_KEY.format(scope, version, shared)
+        for pk, scope, version in zip(
+            ids, scopes, versions[len(shared_scopes):]
+        )
+    }
+    return singleflight.get_many_or_fill(keys, serialize, FRAGMENT_TIMEOUT)
+
+
+def invalidate(model, *pks):
+    """Повышает версии объектов после фиксации текущей транзакции."""
+    bump_on_commit(*(object_scope(model, pk) for pk in pks))
@@ -0,0 +1,324 @@
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import close_old_connections
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from api import fragments
+from api.versions import get_versions
+
+
+class ReadExecutor:
+    """Пул потоков для чтения, создаётся при первом запросе."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def get(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    settings.ASYNC_READ_THREADS, thread_name_prefix='read'
+                )
+            return self.executor
+
+
+read_executor = ReadExecutor()
+
+
+class AsyncReadMixin:
+    """Асинхронный вариант представления для запуска через ASGI.
+
+    ``as_view`` возвращает обычное синхронное представление с атрибутом
+    ``async_view``, который использует ASGI-обработчик. Синхронные
+    представления Django выполняет в одном общем потоке, поэтому
+    GET-запросы асинхронный вариант выполняет в пуле потоков
+    ``ASYNC_READ_THREADS``, а остальные — как обычно.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+
+        def read(request, *args, **kwargs):
+            # Сигналы начала и конца запроса приходят в другом потоке.
+            close_old_connections()
+            try:
+                response = view(request, *args, **kwargs)
+                # Ответ 304 от ConditionalGetMixin рендерить не нужно.
+                if hasattr(response, 'render'):
+                    response = response.render()
+                return response
+            finally:
+                close_old_connections()
+
+        write = sync_to_async(view)
+
+        async def async_view(request, *args, **kwargs):
+            if request.method in SAFE_METHODS:
+                return await sync_to_async(
+                    read, thread_sensitive=False,
+                    executor=read_executor.get(),
+                )(request, *args, **kwargs)
+            return await write(request, *args, **kwargs)
+
+        async_view.csrf_exempt = True
+        view.async_view = async_view
+        return view
+
+
+class RowListMixin:
+    """Отдаёт список через сериализатор строк ``.values()``.
+
+    Остальные действия по-прежнему используют ``get_serializer_class``.
+    """
+
+    row_serializer_class = None
+
+    def get_row_serializer(self):
+        return self.row_serializer_class()
+
+    def get_row_columns(self):
+        """Колонки, которые нужны помимо полей ответа."""
+        return getattr(self.paginator, 'position_fields', ())
+
+    def get_rows(self, serializer, queryset):
+        return serializer.values(queryset, self.get_row_columns())
+
+    def serialize_rows(self, serializer, rows):
+        return serializer.serialize(rows)
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_row_serializer()
+        queryset = self.get_rows(
+            serializer, self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                self.serialize_rows(serializer, page)
+            )
+        return Response(self.serialize_rows(serializer, queryset))
+
+
+class FragmentCacheMixin:
+    """Представления объектов списка из кеша фрагментов.
+
+    Страница выбирается только по ``id``, готовые представления берутся
+    из кеша, а сериализуются лишь отсутствующие там объекты. Запросы с
+    ``?fields=`` кеш не используют. ``fragment_scopes`` — общие коллекции,
+    от которых зависит представление объекта.
+    """
+
+    fragment_model = None
+    fragment_scopes = ()
+
+    def use_fragments(self):
+        return self.action == 'list' and self.get_sparse_fields() is None
+
+    def get_fragment_queryset(self):
+        """Запрос для сериализации объектов, которых нет в кеше."""
+        return self.get_queryset()
+
+    def get_rows(self, serializer, queryset):
+        if not self.use_fragments():
+            return super().get_rows(serializer, queryset)
+        columns = [
+            column for column in self.get_row_columns() if column != 'id'
+        ]
+        return queryset.values('id', *columns)
+
+    def serialize_rows(self, serializer, rows):
+        if not self.use_fragments():
+            return super().serialize_rows(serializer, rows)
+
+        def serialize(missing):
+            missing_rows = list(serializer.values(
+                self.get_fragment_queryset().filter(pk__in=missing), ('id',)
+            ))
+            return {
+                row['id']: data for row, data in
+                zip(missing_rows, serializer.serialize(missing_rows))
+            }
+
+        found = fragments.get_fragments(
+            self.fragment_model, [row['id'] for row in rows],
+            self.fragment_scopes, serialize,
+        )
+        # Объекты, удалённые после выборки страницы, пропускаются.
+        rows[:] = [row for row in rows if row['id'] in found]
+        return [found[row['id']] for row in rows]
+
+
+class ExpandMixin:
+    """Параметр ``?expand=`` со вложенными данными.
+
+    Каждому имени из ``expansions`` соответствует метод
+    ``expand_<имя>(ids)``, который одним запросом возвращает словарь
+    ``{id: значение}`` для всех объектов страницы.
+    """
+
+    expansions = ()
+    expand_param = 'expand'
+
+    def get_expansions(self):
+        if self.request.method not in SAFE_METHODS:
+            return ()
+        requested = set(
+            self.request.query_params.get(self.expand_param, '').split(',')
+        )
+        return tuple(name for name in self.expansions if name in requested)
+
+    def expand(self, ids, items):
+        for name in self.get_expansions():
+            values = getattr(self, f'expand_{name}')(ids)
+            for pk, item in zip(ids, items):
+                item[name] = values[pk]
+
+    def get_row_columns(self):
+        columns = super().get_row_columns()
+        if self.get_expansions():
+            columns = (*columns, 'id')
+        return columns
+
+    def serialize_rows(self, serializer, rows):
+        data = super().serialize_rows(serializer, rows)
+        if self.get_expansions():
+            self.expand([row['id'] for row in rows], data)
+        return data
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        if self.get_expansions() and (
+                response.status_code == status.HTTP_200_OK):
+            lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            pk = self.get_queryset().model._meta.pk.to_python(lookup)
+            self.expand([pk], [response.data])
+        return response
+
+
+class SelectablePaginationMixin:
+    """Выбор пагинации параметром ``?pagination=``.
+
+    ``pagination_classes`` сопоставляет значения параметра с классами
+    пагинации, без параметра используется ``pagination_class``.
+    """
+
+    pagination_classes = {}
+    pagination_query_param = 'pagination'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            name = self.request.query_params.get(self.pagination_query_param)
+            pagination_class = self.pagination_classes.get(
+                name, self.pagination_class
+            )
+            self._paginator = (
+                None if pagination_class is None else pagination_class()
+            )
+        return self._paginator
+
+
+class SparseFieldsViewMixin:
+    """Параметр ``?fields=`` для GET-запросов.
+
+    Оставляет в ответе только перечисленные поля из ``sparse_fields``.
+    Сериализаторы строк выбирают из базы только нужные колонки, а при
+    ``retrieve`` запрос сужается через ``narrow_queryset``.
+    """
+
+    sparse_fields = ()
+    sparse_fields_param = 'fields'
+
+    def get_sparse_fields(self):
+        if self.request.method not in SAFE_METHODS:
+            return None
+        param = self.request.query_params.get(self.sparse_fields_param)
+        if not param:
+            return None
+        requested = set(param.split(','))
+        return tuple(
+            field for field in self.sparse_fields if field in requested
+        ) or None
+
+    def get_row_serializer(self):
+        return self.row_serializer_class(only=self.get_sparse_fields())
+
+    def get_serializer(self, *args, **kwargs):
+        only = self.get_sparse_fields()
+        if only is not None:
+            kwargs['only'] = only
+        return super().get_serializer(*args, **kwargs)
+
+    def narrow_queryset(self, queryset):
+        only = self.get_sparse_fields()
+        if only is None or self.action != 'retrieve':
+            return queryset
+        opts = queryset.model._meta
+        columns, related, prefetch = [opts.pk.name], [], []
+        for name in only:
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_many:
+                prefetch.append(name)
+                continue
+            if field.many_to_one:
+                related.append(name)
+            columns.append(name)
+        return (
+            queryset
+            .only(*columns)
+            .select_related(*related)
+            .prefetch_related(*prefetch)
+        )
+
+
+class ConditionalGetMixin:
+    """ETag и Last-Modified для ``list`` и ``retrieve``.
+
+    Валидаторы строятся из версий коллекций ``get_version_scopes``, поэтому
+    ответ 304 отдаётся без запроса списка и сериализации.
+    """
+
+    def get_version_scopes(self):
+        return ()
+
+    def get_validators(self, request):
+        versions = get_versions(*self.get_version_scopes())
+        key = '|'.join(
+            [request.get_full_path(), request.accepted_media_type or '']
+            + [str(version) for version in versions]
+        )
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        return etag, max(versions) // 1000000
+
+    def conditional(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
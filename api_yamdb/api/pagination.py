@@ -0,0 +1,333 @@
+import base64
+import binascii
+import hashlib
+import json
+
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, LimitOffsetPagination,
+                                       PageNumberPagination, _positive_int)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api import singleflight
+from api.versions import get_versions
+
+
+class PubDateCursorPagination(BasePagination):
+    """Курсорная пагинация по паре ``(pub_date, id)``, новые записи первыми.
+
+    Следующая страница выбирается условием по ключу последней записи, а не
+    смещением, поэтому запрос использует составной индекс по
+    ``(родитель, pub_date, id)`` и не считает общее число записей.
+    """
+
+    position_fields = ('pub_date', 'id')
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Некорректный курсор.'
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        position, self.reverse = self.decode_cursor(request)
+        self.has_cursor = position is not None
+
+        if self.reverse:
+            queryset = queryset.order_by('pub_date', 'id')
+        else:
+            queryset = queryset.order_by('-pub_date', '-id')
+        if position is not None:
+            pub_date, pk = position
+            lookup = 'gt' if self.reverse else 'lt'
+            queryset = queryset.filter(
+                **{f'pub_date__{lookup}': pub_date}
+            ) | queryset.filter(pub_date=pub_date, **{f'id__{lookup}': pk})
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True, cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            pub_date, pk, reverse = json.loads(
+                base64.urlsafe_b64decode(encoded.encode('ascii'))
+            )
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (pub_date, pk), bool(reverse)
+
+    def encode_cursor(self, row, reverse):
+        pub_date, pk = (self.get_value(row, name)
+                        for name in self.position_fields)
+        encoded = base64.urlsafe_b64encode(
+            json.dumps([pub_date.isoformat(), pk, reverse]).encode()
+        ).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def get_value(self, row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    def get_next_link(self):
+        has_next = self.reverse or self.has_more
+        if not self.page or not has_next:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        has_previous = self.has_more if self.reverse else self.has_cursor
+        if not has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class NoCountLimitOffsetPagination(LimitOffsetPagination):
+    """``LimitOffsetPagination`` без ``COUNT(*)``.
+
+    Загружается ``limit + 1`` строка: лишняя строка показывает, что есть
+    следующая страница. Ключа ``count`` в ответе нет.
+    """
+
+    template = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        del response_schema['properties']['count']
+        return response_schema
+
+
+class NoCountPageNumberPagination(PageNumberPagination):
+    """``PageNumberPagination`` без ``COUNT(*)``.
+
+    Номер страницы не проверяется по общему числу записей: пустая
+    страница, кроме первой, даёт 404, как и в ``PageNumberPagination``.
+    """
+
+    template = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        try:
+            self.number = _positive_int(
+                request.query_params.get(self.page_query_param, 1),
+                strict=True
+            )
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params[self.page_query_param],
+                message='',
+            ))
+        offset = (self.number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=self.number, message='',
+            ))
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.page_query_param,
+            self.number + 1
+        )
+
+    def get_previous_link(self):
+        if self.number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.number - 1
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        del response_schema['properties']['count']
+        return response_schema
+
+
+class CachedCountQuerySet:
+    """Обёртка над QuerySet, чей ``count()`` берётся из кеша.
+
+    Пока один запрос пересчитывает число для новой версии коллекций,
+    остальные получают прежнее значение.
+    """
+
+    def __init__(self, queryset, key, version, timeout):
+        self.queryset = queryset
+        self.key = key
+        self.version = version
+        self.timeout = timeout
+        self.cached = False
+
+    @property
+    def ordered(self):
+        return getattr(self.queryset, 'ordered', True)
+
+    def count(self):
+        count, self.cached = singleflight.get_or_fill(
+            self.key, self.version, self.queryset.count, self.timeout,
+            stale=True,
+        )
+        return count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        return self.queryset[index]
+
+
+class CachedCountMixin:
+    """Берёт ``count`` из кеша вместо ``COUNT(*)`` на каждый запрос.
+
+    Ключ кеша — путь и параметры фильтрации без параметров пагинации,
+    число хранится вместе с версиями коллекций ``view.get_count_scopes()``
+    или, если его нет, ``view.get_version_scopes()``.
+    После записи в таблицы число пересчитывает один запрос, а остальные
+    до этого получают прежнее. Флаг ``count_cached`` в ответе показывает,
+    что число взято из кеша.
+    """
+
+    count_cache_timeout = 60 * 60
+    count_ignored_params = ('pagination', 'fields', 'cursor',
+                            api_settings.URL_FORMAT_OVERRIDE)
+
+    def get_count_key(self, request, view):
+        """Ключ кеша и версия числа записей или ``(None, None)``."""
+        scopes = getattr(view, 'get_count_scopes', None) or getattr(
+            view, 'get_version_scopes', None
+        )
+        if scopes is None:
+            return None, None
+        ignored = set(self.count_ignored_params) | {
+            getattr(self, name, None) for name in (
+                'page_query_param', 'page_size_query_param',
+                'limit_query_param', 'offset_query_param',
+            )
+        }
+        params = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            if name not in ignored
+            for value in values
+            if value
+        )
+        key = json.dumps([request.path, params], ensure_ascii=False)
+        return (
+            'count:' + hashlib.md5(key.encode()).hexdigest(),
+            get_versions(*scopes()),
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        key, version = self.get_count_key(request, view)
+        if key is not None:
+            queryset = CachedCountQuerySet(
+                queryset, key, version, self.count_cache_timeout
+            )
+        self.counted = queryset
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data['count_cached'] = getattr(self.counted, 'cached', False)
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_cached'] = {'type': 'boolean'}
+        return response_schema
+
+
+class CachedCountLimitOffsetPagination(CachedCountMixin,
+                                       LimitOffsetPagination):
+    pass
+
+
+class CachedCountPageNumberPagination(CachedCountMixin, PageNumberPagination):
+    pass
@@ -0,0 +1,148 @@
+from rest_framework import serializers
+
+from reviews.models import GenreTitle
+
+
+class RowSerializer:
+    """Сериализатор строк ``QuerySet.values()`` для списков.
+
+    Даёт тот же JSON, что и соответствующий ``ModelSerializer``, но без
+    интроспекции полей и вызова ``to_representation`` на каждое поле.
+    ``fields`` — пары (ключ ответа, колонка ``values()``), ``converters`` —
+    преобразования значений по ключу ответа. Аргумент ``only`` оставляет
+    в ответе и в запросе только перечисленные поля.
+    """
+
+    fields = ()
+    converters = {}
+
+    def __init__(self, only=None):
+        self.only = only
+        self.accessors = tuple(
+            (key, column, self.converters.get(key))
+            for key, column in self.fields
+            if self.includes(key)
+        )
+
+    def includes(self, key):
+        return self.only is None or key in self.only
+
+    @property
+    def columns(self):
+        return [column for _, column, _ in self.accessors]
+
+    def values(self, queryset, extra=()):
+        columns = self.columns
+        return queryset.values(
+            *columns, *(column for column in extra if column not in columns)
+        )
+
+    def to_representation(self, row):
+        data = {}
+        for key, column, convert in self.accessors:
+            value = row[column]
+            if convert is not None and value is not None:
+                value = convert(value)
+            data[key] = value
+        return data
+
+    def serialize(self, rows):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+class ReviewRowSerializer(RowSerializer):
+    """Аналог ``ReviewSerializer`` для списка отзывов."""
+
+    fields = (
+        ('id', 'id'),
+        ('text', 'text'),
+        ('author', 'author__username'),
+        ('score', 'score'),
+        ('pub_date', 'pub_date'),
+        ('comments_count', 'comments_count'),
+    )
+    converters = {
+        'pub_date': serializers.DateTimeField().to_representation,
+    }
+
+
+class ReviewCommentRowSerializer(RowSerializer):
+    """Аналог ``ReviewCommentSerializer`` для списка комментариев."""
+
+    fields = (
+        ('id', 'id'),
+        ('text', 'text'),
+        ('author', 'author__username'),
+        ('pub_date', 'pub_date'),
+    )
+    converters = {
+        'pub_date': serializers.DateTimeField().to_representation,
+    }
+
+
+class CatalogRowSerializer(RowSerializer):
+    """Аналог ``GenreSerializer`` и ``CategorySerializer``."""
+
+    fields = (
+        ('name', 'name'),
+        ('slug', 'slug'),
+    )
+
+
+class TitleRowSerializer(RowSerializer):
+    """Аналог ``TitleGetSerializer`` для списка произведений.
+
+    Жанры всей страницы загружаются одним запросом к ``GenreTitle``.
+    """
+
+    fields = (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('year', 'year'),
+        ('rating', 'rating'),
+        ('description', 'description'),
+        ('reviews_count', 'reviews_count'),
+    )
+    converters = {
+        'rating': float,
+    }
+
+    @property
+    def columns(self):
+        columns = super().columns
+        if self.includes('category'):
+            columns += ['category__name', 'category__slug']
+        if self.includes('genre') and 'id' not in columns:
+            columns.append('id')
+        return columns
+
+    def to_representation(self, row):
+        data = super().to_representation(row)
+        if self.includes('genre'):
+            data['genre'] = []
+        if self.includes('category'):
+            slug = row['category__slug']
+            data['category'] = (
+                None if slug is None
+                else {'name': row['category__name'], 'slug': slug}
+            )
+        if 'reviews_count' in data:
+            # Порядок ключей как у TitleGetSerializer.
+            data['reviews_count'] = data.pop('reviews_count')
+        return data
+
+    def serialize(self, rows):
+        data = super().serialize(rows)
+        if not self.includes('genre'):
+            return data
+        genres = {row['id']: title['genre'] for row, title in zip(rows, data)}
+        genre_rows = (
+            GenreTitle.objects
+            .filter(title_id__in=genres)
+            .order_by('genre__slug')
+            .values_list('title_id', 'genre__name', 'genre__slug')
+        )
+        for title_id, name, slug in genre_rows:
+            genres[title_id].append({'name': name, 'slug': slug})
+        return data
@@ -4,7 +4,19 @@ from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.relations import SlugRelatedField
 
-from reviews.models import Category, Genre, Review, ReviewComment, Title
+from api import snapshots
+from reviews.models import (SCORES, Category, Genre, Review, ReviewComment,
+                            Title)
+
+
+class SparseFieldsMixin:
+    """Оставляет в сериализаторе только поля из аргумента ``only``."""
+
+    def __init__(self, *args, only=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if only is not None:
+            for name in set(self.fields) - set(only):
+                self.fields.pop(name)
 
 
 class ReviewPostSerializer(serializers.ModelSerializer):
@@ -13,7 +25,8 @@ class ReviewPostSerializer(serializers.ModelSerializer):
     author = SlugRelatedField(slug_field='username', read_only=True)
 
     class Meta:
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = ('id', 'text', 'author', 'score', 'pub_date',
+                  'comments_count')
         model = Review
 
     def validate_score(self, score):
@@ -31,17 +44,19 @@ class ReviewPostSerializer(serializers.ModelSerializer):
         return data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для отзыва на произведение."""
 
     author = SlugRelatedField(slug_field='username', read_only=True)
 
     class Meta:
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = ('id', 'text', 'author', 'score', 'pub_date',
+                  'comments_count')
         model = Review
 
 
-class ReviewCommentSerializer(serializers.ModelSerializer):
+class ReviewCommentSerializer(SparseFieldsMixin,
+                              serializers.ModelSerializer):
     """Сериализатор для комментария к отзыву на произведение."""
 
     author = SlugRelatedField(
@@ -71,7 +86,7 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleGetSerializer(serializers.ModelSerializer):
+class TitleGetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для получения данных о произведении."""
 
     category = CategorySerializer(read_only=True)
@@ -83,18 +98,55 @@ class TitleGetSerializer(serializers.ModelSerializer):
 
     class Meta:
         fields = ('id', 'name', 'year', 'rating', 'description',
-                  'genre', 'category')
+                  'genre', 'category', 'reviews_count')
         model = Title
 
 
+class TitleDetailSerializer(TitleGetSerializer):
+    """Произведение вместе с распределением оценок.
+
+    Счётчики берутся из ``TitleRating`` без запроса к отзывам.
+    """
+
+    scores = serializers.SerializerMethodField()
+
+    class Meta(TitleGetSerializer.Meta):
+        fields = TitleGetSerializer.Meta.fields + ('scores',)
+
+    def get_scores(self, title):
+        try:
+            return title.rating_stats.histogram
+        except Title.rating_stats.RelatedObjectDoesNotExist:
+            return {str(score): 0 for score in SCORES}
+
+
+class SnapshotSlugRelatedField(SlugRelatedField):
+    """Находит объект по slug в снимке справочника без запроса к базе."""
+
+    def __init__(self, snapshot, **kwargs):
+        self.snapshot = snapshot
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        instance = self.snapshot.get_instance(data)
+        if instance is None:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=data)
+        return instance
+
+
 class TitlePostSerializer(serializers.ModelSerializer):
     """Сериализатор для создания произведения."""
 
-    category = serializers.SlugRelatedField(
+    category = SnapshotSlugRelatedField(
+        snapshot=snapshots.categories,
         queryset=Category.objects.all(),
         slug_field='slug'
     )
-    genre = serializers.SlugRelatedField(
+    genre = SnapshotSlugRelatedField(
+        snapshot=snapshots.genres,
         queryset=Genre.objects.all(),
         slug_field='slug',
         many=True
@@ -103,7 +155,7 @@ class TitlePostSerializer(serializers.ModelSerializer):
 
     class Meta:
         fields = ('id', 'name', 'year', 'rating', 'description',
-                  'genre', 'category')
+                  'genre', 'category', 'reviews_count')
         model = Title
 
     def to_representation(self, instance):
@@ -125,3 +177,23 @@ class TitlePostSerializer(serializers.ModelSerializer):
                 'Значение не может быть меньше 0.'
             )
         return data
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """Подзапрос пакетного запроса."""
+
+    path = serializers.CharField()
+
+
+class BatchSerializer(serializers.Serializer):
+    """Список GET-подзапросов пакетного запроса."""
+
+    requests = BatchRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, requests):
+        max_requests = self.context['view'].max_requests
+        if len(requests) > max_requests:
+            raise serializers.ValidationError(
+                f'Не больше {max_requests} подзапросов в одном запросе.'
+            )
+        return requests
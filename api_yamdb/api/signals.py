@@ -0,0 +1,209 @@
+from django.db.models.signals import (m2m_changed, post_delete,
+                                      post_migrate, post_save)
+from django.db import transaction
+from django.dispatch import receiver
+
+from api import events, facets, fragments
+from api.serializers import ReviewCommentSerializer, ReviewSerializer
+from api.versions import (CATEGORIES, GENRES, REVIEWS, TITLES, USERNAMES,
+                          USERS, bump_on_commit, comments_scope,
+                          reset_versions, reviews_scope)
+from reviews.aggregates import aggregates_recomputed
+from reviews.deletion import soft_deleted, user_comments
+from reviews.models import (Category, Genre, GenreTitle, Review,
+                            ReviewComment, Title, TitleRating)
+from users.models import User
+from users.signals import username_changed
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    bump_on_commit(
+        TITLES, REVIEWS, reviews_scope(instance.title_id),
+        comments_scope(instance.pk),
+    )
+    # Рейтинг и число отзывов входят в представление произведения.
+    fragments.invalidate(Title, instance.title_id)
+    fragments.invalidate(Review, instance.pk)
+
+
+@receiver(post_save, sender=ReviewComment)
+@receiver(post_delete, sender=ReviewComment)
+def comment_changed(sender, instance, **kwargs):
+    # Счётчик комментариев входит в ответы списка отзывов.
+    bump_on_commit(
+        REVIEWS, comments_scope(instance.review_id),
+        reviews_scope(instance.review.title_id),
+    )
+    fragments.invalidate(ReviewComment, instance.pk)
+    fragments.invalidate(Review, instance.review_id)
+
+
+@receiver(post_save, sender=Review)
+def review_created(sender, instance, created, **kwargs):
+    if not created or not events.broker.has_subscribers(instance.title_id):
+        return
+    data = ReviewSerializer(instance).data
+    transaction.on_commit(lambda: events.broker.publish(
+        instance.title_id, 'review', f'review:{instance.pk}', data
+    ))
+
+
+@receiver(post_save, sender=ReviewComment)
+def comment_created(sender, instance, created, **kwargs):
+    title_id = instance.review.title_id
+    if not created or not events.broker.has_subscribers(title_id):
+        return
+    data = dict(ReviewCommentSerializer(instance).data,
+                review=instance.review_id)
+    transaction.on_commit(lambda: events.broker.publish(
+        title_id, 'comment', f'comment:{instance.pk}', data
+    ))
+
+
+@receiver(post_save, sender=TitleRating)
+@receiver(post_delete, sender=TitleRating)
+def rating_changed(sender, **kwargs):
+    # Рейтинг пересчитывается отложенной задачей уже после записи отзыва.
+    bump_on_commit(TITLES)
+
+
+@receiver(aggregates_recomputed)
+def aggregates_changed(sender, title_ids, **kwargs):
+    # Пересчёт обновляет счётчики через update() без сигналов моделей.
+    bump_on_commit(
+        TITLES, REVIEWS, *(reviews_scope(pk) for pk in title_ids)
+    )
+    fragments.invalidate(Title, *title_ids)
+    fragments.invalidate(Review, *Review.objects.filter(
+        title_id__in=title_ids
+    ).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    bump_on_commit(TITLES, reviews_scope(instance.pk))
+    fragments.invalidate(Title, instance.pk)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    facets.index.title_saved(
+        instance.pk, instance.category_id, int(instance.year)
+    )
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    facets.index.title_deleted(instance.pk)
+
+
+@receiver(soft_deleted, sender=Title)
+def titles_hidden(sender, pks, **kwargs):
+    bump_on_commit(TITLES, *(reviews_scope(pk) for pk in pks))
+    fragments.invalidate(Title, *pks)
+    for pk in pks:
+        facets.index.title_deleted(pk)
+
+
+@receiver(soft_deleted, sender=User)
+def users_hidden(sender, pks, **kwargs):
+    # Вместе с пользователями скрываются их отзывы и комментарии.
+    rows = {
+        *Review._base_manager.filter(author_id__in=pks)
+        .values_list('pk', 'title_id'),
+        *user_comments(pks).values_list('review_id', 'review__title_id'),
+    }
+    bump_on_commit(
+        USERS, TITLES, REVIEWS,
+        *(reviews_scope(title_id) for _, title_id in rows),
+        *(comments_scope(review_id) for review_id, _ in rows),
+    )
+    fragments.invalidate(Review, *(review_id for review_id, _ in rows))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, **kwargs):
+    bump_on_commit(TITLES, GENRES)
+
+
+@receiver(post_delete, sender=Genre)
+def genre_deleted(sender, instance, **kwargs):
+    facets.index.genre_deleted(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    bump_on_commit(TITLES, CATEGORIES)
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    facets.index.category_deleted(instance.pk)
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_title_changed(sender, instance, **kwargs):
+    bump_on_commit(TITLES)
+    fragments.invalidate(Title, instance.title_id)
+
+
+@receiver(post_save, sender=GenreTitle)
+def genre_title_saved(sender, instance, **kwargs):
+    facets.index.genres_added(instance.title_id, [instance.genre_id])
+
+
+@receiver(post_delete, sender=GenreTitle)
+def genre_title_deleted(sender, instance, **kwargs):
+    facets.index.genres_removed(instance.title_id, [instance.genre_id])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    bump_on_commit(TITLES)
+    if reverse:
+        # Изменены произведения жанра: pk_set содержит id произведений.
+        if action == 'post_clear':
+            bump_on_commit(GENRES)
+            facets.index.genre_deleted(instance.pk)
+            return
+        fragments.invalidate(Title, *pk_set)
+        handler = (facets.index.genres_added if action == 'post_add'
+                   else facets.index.genres_removed)
+        for title_id in pk_set:
+            handler(title_id, [instance.pk])
+        return
+    fragments.invalidate(Title, instance.pk)
+    if action == 'post_add':
+        facets.index.genres_added(instance.pk, pk_set)
+    elif action == 'post_remove':
+        facets.index.genres_removed(instance.pk, pk_set)
+    else:
+        facets.index.genres_removed(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, **kwargs):
+    bump_on_commit(USERS)
+
+
+@receiver(username_changed)
+def username_saved(sender, **kwargs):
+    # Из полей пользователя отзывы и комментарии показывают только логин.
+    bump_on_commit(USERNAMES)
+
+
+@receiver(post_migrate, dispatch_uid='api.reset_versions')
+def database_reset(sender, **kwargs):
+    # Сигнал приходит от каждого приложения, версии хватит сбросить раз.
+    if sender.name == 'reviews':
+        reset_versions()
@@ -0,0 +1,95 @@
+"""Заполнение кеша одним запросом.
+
+Когда значения нет в кеше, его вычисляет только запрос, получивший
+блокировку ``cache.add``. Остальные ждут результата или, если есть
+устаревшее значение, сразу отдают его. ``cache.add`` атомарен в общих
+бэкендах кеша, поэтому блокировка действует и между процессами.
+"""
+import time
+
+from django.core.cache import cache
+
+LOCK_KEY = 'lock:{}'
+LOCK_TIMEOUT = 10
+WAIT_TIMEOUT = 0.5
+POLL_INTERVAL = 0.02
+
+
+def acquire(*keys):
+    """Ключи, блокировку которых удалось получить."""
+    return [
+        key for key in keys
+        if cache.add(LOCK_KEY.format(key), True, LOCK_TIMEOUT)
+    ]
+
+
+def release(*keys):
+    cache.delete_many([LOCK_KEY.format(key) for key in keys])
+
+
+def get_or_fill(key, version, fill, timeout=None, stale=False):
+    """Значение ``fill()`` для версии ``version``.
+
+    Значение хранится вместе с версией. При ``stale=True`` значение
+    прежней версии отдаётся, пока другой запрос вычисляет новое.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1], True
+    if acquire(key):
+        try:
+            value = fill()
+            cache.set(key, (version, value), timeout)
+        finally:
+            release(key)
+        return value, False
+    if entry is not None and stale:
+        return entry[1], True
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1], True
+    return fill(), False
+
+
+def get_many_or_fill(keys, fill, timeout=None):
+    """Значения для словаря ``{id: ключ кеша}``.
+
+    ``fill(ids)`` возвращает словарь ``{id: значение}`` для отсутствующих
+    в кеше. Каждое значение вычисляет только один запрос, остальные ждут
+    его результата; отсутствующие в ответе ``fill`` id пропускаются.
+    """
+    cached = cache.get_many(keys.values())
+    result = {pk: cached[key] for pk, key in keys.items() if key in cached}
+    missing = [pk for pk in keys if pk not in result]
+    if not missing:
+        return result
+    owned = acquire(*(keys[pk] for pk in missing))
+    try:
+        owned_ids = [pk for pk in missing if keys[pk] in owned]
+        if owned_ids:
+            result.update(_fill(keys, owned_ids, fill, timeout))
+        waiting = [pk for pk in missing if keys[pk] not in owned]
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while waiting and time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            cached = cache.get_many([keys[pk] for pk in waiting])
+            result.update(
+                (pk, cached[keys[pk]]) for pk in waiting if keys[pk] in cached
+            )
+            waiting = [pk for pk in waiting if pk not in result]
+        if waiting:
+            result.update(_fill(keys, waiting, fill, timeout))
+    finally:
+        release(*owned)
+    return result
+
+
+def _fill(keys, ids, fill, timeout):
+    values = fill(ids)
+    cache.set_many(
+        {keys[pk]: value for pk, value in values.items()}, timeout
+    )
+    return values
@@ -0,0 +1,68 @@
+from django.db import router
+
+from api.versions import CATEGORIES, GENRES, bus, get_version
+from reviews.models import Category, Genre
+
+
+class SnapshotState:
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.items = [{'name': name, 'slug': slug} for _, name, slug in rows]
+        self.ids = {slug: pk for pk, _, slug in rows}
+        self.by_id = {
+            pk: item for (pk, _, _), item in zip(rows, self.items)
+        }
+
+
+class CatalogSnapshot:
+    """Снимок справочника в памяти процесса.
+
+    Хранит все записи модели в порядке ``slug`` и перечитывает их из базы
+    только после изменения версии коллекции ``scope``.
+    """
+
+    def __init__(self, model, scope):
+        self.model = model
+        self.scope = scope
+        self.state = None
+        bus.subscribe(scope, self.clear)
+
+    def clear(self, version):
+        state = self.state
+        if state is not None and state.version != version:
+            self.state = None
+
+    def get_state(self):
+        version = get_version(self.scope)
+        state = self.state
+        if state is None or state.version != version:
+            rows = self.model.objects.order_by('slug').values_list(
+                'id', 'name', 'slug'
+            )
+            state = self.state = SnapshotState(version, list(rows))
+        return state
+
+    def items(self):
+        """Список записей в виде ``{'name': ..., 'slug': ...}``."""
+        return self.get_state().items
+
+    def get_id(self, slug):
+        return self.get_state().ids.get(slug)
+
+    def get_instance(self, slug):
+        """Экземпляр модели по ``slug`` без запроса к базе или ``None``."""
+        state = self.get_state()
+        pk = state.ids.get(slug)
+        if pk is None:
+            return None
+        item = state.by_id[pk]
+        return self.model.from_db(
+            router.db_for_read(self.model),
+            ['id', 'name', 'slug'],
+            [pk, item['name'], item['slug']],
+        )
+
+
+genres = CatalogSnapshot(Genre, GENRES)
+categories = CatalogSnapshot(Category, CATEGORIES)
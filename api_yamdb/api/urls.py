@@ -2,8 +2,9 @@ from django.urls import include, path
 from rest_framework import routers
 
 from users.views import SignUpView, TokenView, UserViewSet
-from api.views import (CategoryViewSet, GenreViewSet, ReviewCommentViewSet,
-                       ReviewViewSet, TitleViewSet)
+from api.views import (BatchView, CategoryViewSet, ChangeViewSet,
+                       GenreViewSet, ReviewCommentViewSet, ReviewViewSet,
+                       TitleViewSet)
 
 routerv1 = routers.DefaultRouter()
 routerv1.register('users', UserViewSet, basename='users')
@@ -32,6 +33,7 @@ routerv1.register(
     TitleViewSet,
     basename='titles'
 )
+routerv1.register('changes', ChangeViewSet, basename='changes')
 
 auth_urls = [
     path('signup/', SignUpView.as_view(), name='signup'),
@@ -39,6 +41,7 @@ auth_urls = [
 ]
 
 urlpatterns = [
+    path('v1/batch/', BatchView.as_view(router=routerv1), name='batch'),
     path('v1/', include(routerv1.urls)),
     path('v1/auth/', include(auth_urls)),
 ]
@@ -0,0 +1,107 @@
+"""Версии коллекций для условных запросов и кешей.
+
+Версия — время последнего изменения коллекции в микросекундах. Она
+монотонно растёт и хранится в кеше Django, поэтому её проверка не
+обращается к базе данных. Версии общих коллекций хранятся в ``bus`` —
+векторе в разделяемой памяти, который процессы читают без обращения к
+кешу.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from api.bus import VersionBus
+
+VERSION_KEY = 'version:{}'
+
+TITLES = 'titles'
+FACETS = 'facets'
+GENRES = 'genres'
+CATEGORIES = 'categories'
+USERS = 'users'
+USERNAMES = 'usernames'
+# Любые отзывы и комментарии, например для вложенных отзывов произведений.
+REVIEWS = 'reviews'
+
+bus = VersionBus(
+    (TITLES, FACETS, GENRES, CATEGORIES, USERS, USERNAMES, REVIEWS)
+)
+
+
+def reviews_scope(title_id):
+    return f'reviews:{title_id}'
+
+
+def comments_scope(review_id):
+    return f'comments:{review_id}'
+
+
+def object_scope(model, pk):
+    return f'{model._meta.label_lower}:{pk}'
+
+
+def _now():
+    return time.time_ns() // 1000
+
+
+def get_versions(*scopes):
+    """Возвращает версии коллекций, создавая отсутствующие."""
+    found = {}
+    keys = {}
+    for scope in scopes:
+        if scope in bus:
+            found[scope] = bus.read(scope) or bus.bump(scope)[0][1]
+        else:
+            keys[VERSION_KEY.format(scope)] = scope
+    if keys:
+        versions = cache.get_many(keys)
+        missing = [key for key in keys if key not in versions]
+        if missing:
+            now = _now()
+            for key in missing:
+                cache.add(key, now, None)
+            versions.update(cache.get_many(missing))
+        found.update((keys[key], version) for key, version in versions.items())
+    return [found[scope] for scope in scopes]
+
+
+def get_version(scope):
+    return get_versions(scope)[0]
+
+
+def bump_versions(*scopes):
+    """Отмечает коллекции изменёнными и возвращает их новые версии."""
+    shared = [scope for scope in scopes if scope in bus]
+    found = {
+        scope: version
+        for scope, (_, version) in zip(shared, bus.bump(*shared))
+    }
+    keys = {
+        VERSION_KEY.format(scope): scope
+        for scope in scopes if scope not in bus
+    }
+    if keys:
+        versions = cache.get_many(keys)
+        now = _now()
+        versions = {
+            key: max(now, versions.get(key, 0) + 1) for key in keys
+        }
+        cache.set_many(versions, None)
+        found.update((keys[key], version) for key, version in versions.items())
+    return [found[scope] for scope in scopes]
+
+
+def bump_on_commit(*scopes):
+    """Повышает версии после фиксации текущей транзакции.
+
+    Иначе запрос, пришедший до фиксации, получит новую версию со старыми
+    данными и закеширует их под ней.
+    """
+    transaction.on_commit(lambda: bump_versions(*scopes))
+
+
+def reset_versions():
+    """Сбрасывает все версии, например после очистки базы."""
+    cache.clear()
+    bus.bump(*bus.slots)
@@ -1,20 +1,62 @@
-from django.db import models
+from urllib.parse import urlsplit
+
+from django.db import transaction
+from django.http import HttpRequest, QueryDict
 from django.shortcuts import get_object_or_404
+from django.urls import Resolver404, resolve
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, mixins, permissions, viewsets
-from rest_framework.pagination import PageNumberPagination
+from rest_framework import filters, mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
-from api.filters import FilterTitle
+from api import snapshots
+from api.authentication import BATCH_AUTH_ATTR
+from api.changes import get_changes
+from api.filters import FacetFilterBackend, FilterTitle
+from api.mixins import (AsyncReadMixin, ConditionalGetMixin, ExpandMixin,
+                        FragmentCacheMixin, RowListMixin,
+                        SelectablePaginationMixin, SparseFieldsViewMixin)
+from api.pagination import (CachedCountPageNumberPagination,
+                            NoCountLimitOffsetPagination,
+                            NoCountPageNumberPagination,
+                            PubDateCursorPagination)
 from api.permissions import IsAdminOrReadOnly, IsOwnerOrIsAdminOrIsModerator
-from api.serializers import (CategorySerializer, GenreSerializer,
+from api.row_serializers import (ReviewCommentRowSerializer,
+                                 ReviewRowSerializer, TitleRowSerializer)
+from api.serializers import (BatchSerializer, CategorySerializer,
+                             GenreSerializer,
                              ReviewCommentSerializer, ReviewPostSerializer,
-                             ReviewSerializer, TitleGetSerializer,
-                             TitlePostSerializer)
-from reviews.models import Category, Genre, Review, Title
+                             ReviewSerializer, TitleDetailSerializer,
+                             TitleGetSerializer, TitlePostSerializer)
+from api.versions import (CATEGORIES, FACETS, GENRES, REVIEWS, TITLES,
+                          USERNAMES, comments_scope, reviews_scope)
+from reviews.models import (Category, Genre, Review, ReviewComment, Title,
+                            TitleRating)
+
+TOP_LIMIT = 10
+MAX_TOP_LIMIT = 100
+BATCH_HEADERS = ('ETag', 'Last-Modified')
+CHANGES_LIMIT = 100
+MAX_CHANGES_LIMIT = 1000
+LATEST_REVIEWS_COUNT = 3
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(AsyncReadMixin, ConditionalGetMixin,
+                    SelectablePaginationMixin, SparseFieldsViewMixin,
+                    FragmentCacheMixin, RowListMixin, viewsets.ModelViewSet):
+    row_serializer_class = ReviewRowSerializer
+    fragment_model = Review
+    fragment_scopes = (USERNAMES,)
+    pagination_classes = {
+        'cursor': PubDateCursorPagination,
+        'nocount': NoCountLimitOffsetPagination,
+    }
+    sparse_fields = ('id', 'text', 'author', 'score', 'pub_date',
+                     'comments_count')
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_current_title(self):
@@ -25,6 +67,9 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return ReviewPostSerializer
         return ReviewSerializer
 
+    def get_version_scopes(self):
+        return (reviews_scope(self.kwargs['title_id']), USERNAMES)
+
     def get_permissions(self):
         if self.action in ['partial_update', 'destroy']:
             return (IsOwnerOrIsAdminOrIsModerator(),)
@@ -32,18 +77,37 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return (AllowAny(),)
         return (IsAuthenticated(),)
 
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(
             title=self.get_current_title(),
             author=self.request.user,
         )
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        # Оценка и распределение оценок произведения меняются вместе.
+        serializer.save()
+
     def get_queryset(self):
-        return self.get_current_title().reviews.all()
+        return self.narrow_queryset(
+            Review.objects.of_title(self.get_current_title())
+        )
 
 
-class ReviewCommentViewSet(viewsets.ModelViewSet):
+class ReviewCommentViewSet(AsyncReadMixin, ConditionalGetMixin,
+                           SelectablePaginationMixin, SparseFieldsViewMixin,
+                           FragmentCacheMixin, RowListMixin,
+                           viewsets.ModelViewSet):
     serializer_class = ReviewCommentSerializer
+    row_serializer_class = ReviewCommentRowSerializer
+    fragment_model = ReviewComment
+    fragment_scopes = (USERNAMES,)
+    pagination_classes = {
+        'cursor': PubDateCursorPagination,
+        'nocount': NoCountLimitOffsetPagination,
+    }
+    sparse_fields = ('id', 'text', 'author', 'pub_date')
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_current_review(self):
@@ -58,6 +122,10 @@ class ReviewCommentViewSet(viewsets.ModelViewSet):
             return (AllowAny(),)
         return (IsAuthenticated(),)
 
+    def get_version_scopes(self):
+        return (comments_scope(self.kwargs['review_id']), USERNAMES)
+
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(
             review=self.get_current_review(),
@@ -65,18 +133,32 @@ class ReviewCommentViewSet(viewsets.ModelViewSet):
         )
 
     def get_queryset(self):
-        return self.get_current_review().comments.all()
+        return self.narrow_queryset(
+            ReviewComment.objects.of_review(self.get_current_review())
+        )
 
 
 class GenreCategoryViewSet(mixins.ListModelMixin, mixins.CreateModelMixin,
                            mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """Справочник, список которого отдаётся из снимка в памяти процесса."""
 
-    """
-    """
+    snapshot = None
+
+    def list(self, request, *args, **kwargs):
+        items = self.snapshot.items()
+        search = request.query_params.get(api_settings.SEARCH_PARAM, '')
+        for term in search.replace(',', ' ').split():
+            term = term.casefold()
+            items = [item for item in items if term in item['name'].casefold()]
+        page = self.paginate_queryset(items)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(items)
 
 
 class CategoryViewSet(GenreCategoryViewSet):
     queryset = Category.objects.all()
+    snapshot = snapshots.categories
     serializer_class = CategorySerializer
     search_fields = ('name', )
     lookup_field = 'slug'
@@ -86,6 +168,7 @@ class CategoryViewSet(GenreCategoryViewSet):
 
 class GenreViewSet(GenreCategoryViewSet):
     queryset = Genre.objects.all()
+    snapshot = snapshots.genres
     serializer_class = GenreSerializer
     search_fields = ('name', )
     lookup_field = 'slug'
@@ -93,21 +176,217 @@ class GenreViewSet(GenreCategoryViewSet):
     permission_classes = [IsAdminOrReadOnly]
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = (
-        Title.objects
-        .annotate(rating=models.Avg("reviews__score"))
-        .order_by("id")
-    )
+class TitleViewSet(AsyncReadMixin, ConditionalGetMixin,
+                   SelectablePaginationMixin, SparseFieldsViewMixin,
+                   ExpandMixin, FragmentCacheMixin, RowListMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.order_by("id")
     serializer_class = TitleGetSerializer
+    row_serializer_class = TitleRowSerializer
+    sparse_fields = ('id', 'name', 'year', 'rating', 'description',
+                     'genre', 'category', 'reviews_count', 'scores')
     http_method_names = ['get', 'post', 'patch', 'delete']
-    pagination_class = PageNumberPagination
-    filter_backends = (DjangoFilterBackend,)
+    pagination_class = CachedCountPageNumberPagination
+    pagination_classes = {'nocount': NoCountPageNumberPagination}
+    expansions = ('latest_reviews',)
+    fragment_model = Title
+    fragment_scopes = (GENRES, CATEGORIES)
+    filter_backends = (DjangoFilterBackend, FacetFilterBackend)
     filterset_class = FilterTitle
     search_fields = ('name', 'year', 'genre__slug', 'category__slug')
     permission_classes = (IsAdminOrReadOnly,)
 
+    def get_version_scopes(self):
+        if self.get_expansions():
+            # Вложенные отзывы меняются с комментариями и логинами авторов.
+            return (TITLES, REVIEWS, USERNAMES)
+        return (TITLES,)
+
+    def get_count_scopes(self):
+        # Отзывы и рейтинги не меняют число подходящих произведений.
+        return (FACETS, GENRES, CATEGORIES)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        only = self.get_sparse_fields()
+        # Для кеша фрагментов страница выбирается только по id.
+        if (only is None or 'rating' in only) and not self.use_fragments():
+            queryset = self.annotate_rating(queryset)
+        queryset = self.narrow_queryset(queryset)
+        if self.action == 'retrieve' and (only is None or 'scores' in only):
+            queryset = queryset.select_related('rating_stats')
+        return queryset
+
+    def annotate_rating(self, queryset):
+        return queryset.with_rating()
+
+    def get_fragment_queryset(self):
+        return self.annotate_rating(super().get_fragment_queryset())
+
     def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return TitleDetailSerializer
         if self.request.method in permissions.SAFE_METHODS:
             return TitleGetSerializer
         return TitlePostSerializer
+
+    def expand_latest_reviews(self, ids):
+        """Новые отзывы каждого произведения."""
+        latest = {pk: [] for pk in ids}
+        reviews = Review.objects.latest_per_title(
+            ids, LATEST_REVIEWS_COUNT
+        ).select_related('author')
+        for review in reviews:
+            latest[review.title_id].append(review)
+        return {
+            pk: ReviewSerializer(reviews, many=True).data
+            for pk, reviews in latest.items()
+        }
+
+    @action(detail=False)
+    def facets(self, request):
+        """Число произведений по жанрам, категориям и годам."""
+        return self.conditional(self.get_facet_counts, request)
+
+    def get_facet_counts(self, request):
+        queryset = self.filter_queryset(Title.objects.all())
+        return Response(FacetFilterBackend().facet_counts(request, queryset))
+
+    @action(detail=False)
+    def top(self, request):
+        """Лучшие произведения по взвешенному рейтингу.
+
+        Параметры ``genre`` и ``category`` сужают выборку до жанра или
+        категории, ``limit`` задаёт длину списка.
+        """
+        return self.conditional(self.get_top, request)
+
+    def get_top(self, request):
+        ratings = TitleRating.objects.order_by('-weighted_rating', 'title_id')
+        for param, snapshot, lookup in (
+                ('genre', snapshots.genres, 'title__genre'),
+                ('category', snapshots.categories, 'category')):
+            slug = request.query_params.get(param)
+            if not slug:
+                continue
+            pk = snapshot.get_id(slug)
+            ratings = (
+                ratings.none() if pk is None
+                else ratings.filter(**{lookup: pk})
+            )
+        try:
+            limit = int(request.query_params.get('limit', TOP_LIMIT))
+        except ValueError:
+            limit = TOP_LIMIT
+        top = list(
+            ratings.values_list('title_id', 'weighted_rating')[
+                :max(1, min(limit, MAX_TOP_LIMIT))
+            ]
+        )
+        serializer = self.get_row_serializer()
+        rows = list(serializer.values(
+            self.get_queryset().filter(pk__in=[pk for pk, _ in top]), ('id',)
+        ))
+        titles = {
+            row['id']: title
+            for row, title in zip(rows, serializer.serialize(rows))
+        }
+        return Response([
+            dict(titles[pk], weighted_rating=weighted_rating)
+            for pk, weighted_rating in top
+        ])
+
+
+class ChangeViewSet(viewsets.GenericViewSet):
+    """Журнал изменений для инкрементальной синхронизации.
+
+    ``since`` — курсор из поля ``next`` предыдущего ответа, ``limit`` —
+    число записей журнала на странице.
+    """
+
+    permission_classes = (AllowAny,)
+    pagination_class = None
+
+    def get_params(self, request):
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', CHANGES_LIMIT))
+        except ValueError:
+            raise ValidationError(
+                {'since': 'Курсор и limit должны быть целыми числами.'}
+            )
+        if since < 0 or limit < 1:
+            raise ValidationError(
+                {'since': 'Курсор и limit не могут быть отрицательными.'}
+            )
+        return since, min(limit, MAX_CHANGES_LIMIT)
+
+    def list(self, request):
+        return Response(get_changes(*self.get_params(request)))
+
+
+class BatchView(APIView):
+    """Несколько GET-запросов к API за один запрос.
+
+    Подзапросы выполняются внутри процесса представлениями ``router``
+    без middleware и с уже определённым пользователем внешнего запроса.
+    """
+
+    router = None
+    max_requests = 20
+    permission_classes = (AllowAny,)
+
+    def post(self, request):
+        serializer = BatchSerializer(
+            data=request.data, context={'view': self}
+        )
+        serializer.is_valid(raise_exception=True)
+        viewsets = {viewset for _, viewset, _ in self.router.registry}
+        return Response([
+            self.dispatch_subrequest(request, item['path'], viewsets)
+            for item in serializer.validated_data['requests']
+        ])
+
+    def dispatch_subrequest(self, request, url, viewsets):
+        parts = urlsplit(url)
+        try:
+            match = resolve(parts.path)
+        except Resolver404:
+            match = None
+        if match is None or getattr(match.func, 'cls', None) not in viewsets:
+            return {'path': url, 'status': status.HTTP_404_NOT_FOUND,
+                    'headers': {}, 'body': {'detail': 'Страница не найдена.'}}
+        response = match.func(
+            self.build_subrequest(request, parts.path, parts.query),
+            *match.args, **match.kwargs
+        )
+        return {
+            'path': url,
+            'status': response.status_code,
+            'headers': {
+                name: response[name] for name in BATCH_HEADERS
+                if response.has_header(name)
+            },
+            'body': getattr(response, 'data', None),
+        }
+
+    def build_subrequest(self, request, path, query):
+        subrequest = HttpRequest()
+        subrequest.method = 'GET'
+        subrequest.path = subrequest.path_info = path
+        subrequest.META = {
+            key: value for key, value in request.META.items()
+            if not key.startswith(('wsgi.', 'CONTENT_', 'HTTP_IF_'))
+            and key != 'HTTP_AUTHORIZATION'
+        }
+        subrequest.META.update({
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'HTTP_ACCEPT': 'application/json',
+        })
+        subrequest.GET = QueryDict(query)
+        if request.user.is_authenticated:
+            # Токен уже проверен при аутентификации внешнего запроса.
+            setattr(subrequest, BATCH_AUTH_ATTR, (request.user, request.auth))
+        return subrequest
@@ -9,8 +9,30 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+from api.events import EventStreamApp  # noqa: E402
+
+
+class AsyncViewASGIHandler(ASGIHandler):
+    """Использует асинхронный вариант представления ``async_view``,
+    если он есть."""
+
+    def resolve_request(self, request):
+        match = super().resolve_request(request)
+        async_view = getattr(match.func, 'async_view', None)
+        if async_view is not None:
+            match.func = async_view
+        return match
+
+
+django_application = AsyncViewASGIHandler()
+
+# Поток событий произведения обслуживается в обход Django, чтобы
+# открытое соединение не занимало поток синхронного обработчика.
+application = EventStreamApp(django_application)
@@ -0,0 +1,67 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.middleware import csrf
+
+from api.versions import bus
+
+
+def is_api_request(request):
+    return request.path_info.startswith(settings.API_URL_PREFIX)
+
+
+class SkipForAPIMixin:
+    """Пропускает обработку middleware для запросов к API.
+
+    API аутентифицирует пользователей только по JWT, поэтому сессии,
+    сообщения и CSRF нужны лишь админке и HTML-страницам.
+    """
+
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(SkipForAPIMixin,
+                        sessions_middleware.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(SkipForAPIMixin, csrf.CsrfViewMiddleware):
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_api_request(request):
+            return None
+        return super().process_view(
+            request, callback, callback_args, callback_kwargs
+        )
+
+
+class AuthenticationMiddleware(SkipForAPIMixin,
+                               auth_middleware.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(SkipForAPIMixin,
+                        messages_middleware.MessageMiddleware):
+    pass
+
+
+class VersionBusMiddleware:
+    """Сбрасывает данные в памяти процесса, устаревшие после записей в
+    других процессах."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        bus.sync()
+        return self.get_response(request)
@@ -34,18 +34,24 @@ INSTALLED_APPS = [
     'api',
     'reviews',
     'users',
+    'jobs',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'api_yamdb.middleware.VersionBusMiddleware',
+    'api_yamdb.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'api_yamdb.middleware.CsrfViewMiddleware',
+    'api_yamdb.middleware.AuthenticationMiddleware',
+    'api_yamdb.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Запросы с этим префиксом обходят сессии, сообщения и CSRF:
+# API аутентифицирует пользователей только по JWT.
+API_URL_PREFIX = '/api/'
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -78,6 +84,38 @@ DATABASES = {
 }
 
 
+# Cache
+# Версии коллекций, фрагменты и блокировки заполнения хранятся в кеше,
+# общем для процессов на одной машине. Для нескольких машин нужен
+# Memcached или Redis.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'api.cache.SQLiteCache',
+        'LOCATION': BASE_DIR / 'cache.sqlite3',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+        },
+    }
+}
+
+# Файл с версиями общих коллекций, общий для процессов на одной машине.
+VERSION_BUS_PATH = BASE_DIR / 'versions.bus'
+
+# Потоки для GET-запросов к асинхронным представлениям при запуске через
+# ASGI. Каждый поток держит своё соединение с базой.
+ASYNC_READ_THREADS = 8
+
+# Отложенные задачи выполняет команда run_worker. При JOBS_EAGER задачи
+# выполняются в процессе запроса сразу после фиксации транзакции.
+JOBS_EAGER = False
+# Задержка первого повтора задачи в секундах, далее она удваивается.
+JOBS_RETRY_DELAY = 10
+JOBS_MAX_RETRY_DELAY = 60 * 60
+# Через сколько секунд задача зависшего обработчика возвращается в очередь.
+JOBS_LOCK_TIMEOUT = 10 * 60
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -100,10 +138,25 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.SubrequestAuthentication',
+    ],
+    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # Рендерер и парсер на orjson; без orjson работают как стандартные.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
-    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend']
 }
 
+# Число оценок, с которым рейтинг произведения в лидербордах весит
+# столько же, сколько среднее по всем отзывам.
+LEADERBOARD_MIN_VOTES = 5
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=5),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -0,0 +1,39 @@
+from django.contrib import admin
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "name",
+        "status",
+        "attempts",
+        "max_attempts",
+        "run_at",
+        "dedup_key",
+    )
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'dedup_key')
+    readonly_fields = ('locked_by', 'locked_at', 'last_error', 'created_at')
+    actions = ('retry',)
+
+    @admin.action(description='Повторить выбранные задачи')
+    def retry(self, request, queryset):
+        updated = 0
+        for job in queryset.filter(status=Job.FAILED):
+            try:
+                with transaction.atomic():
+                    updated += Job.objects.filter(pk=job.pk).update(
+                        status=Job.PENDING, attempts=0,
+                        run_at=timezone.now(), last_error='',
+                    )
+            except IntegrityError:
+                # Такая задача уже ожидает выполнения.
+                job.delete()
+        self.message_user(request, f'Поставлено в очередь задач: {updated}')
+
+
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,57 @@
+import multiprocessing
+import signal
+
+from django.core.management import BaseCommand
+from django.db import connections
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Выполняет отложенные задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help='Число процессов-обработчиков.'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Пауза в секундах, когда готовых задач нет.'
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Завершиться, когда готовых задач не останется.'
+        )
+
+    def handle(self, *args, processes, sleep, burst, **kwargs):
+        worker = Worker(sleep=sleep, burst=burst)
+        if processes <= 1:
+            processed = worker.run()
+            self.stdout.write(f'Выполнено попыток: {processed}')
+            return
+        # Соединения с базой не должны переходить в дочерние процессы.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        children = [
+            context.Process(target=worker.run) for _ in range(processes)
+        ]
+        for child in children:
+            child.start()
+
+        def stop(signum, frame):
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+
+        handlers = {
+            signum: signal.signal(signum, stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            for child in children:
+                child.join()
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+        self.stdout.write(f'Обработчики завершены: {processes}')
@@ -0,0 +1,69 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """Отложенная задача, выполняемая командой ``run_worker``.
+
+    Успешно выполненные задачи удаляются, задачи, исчерпавшие попытки,
+    остаются со статусом ``failed``. Среди ожидающих задач ключ
+    ``dedup_key`` уникален.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Ожидает'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=200, verbose_name='Задача')
+    kwargs = models.JSONField(default=dict, verbose_name='Аргументы')
+    dedup_key = models.CharField(
+        max_length=200, null=True, blank=True,
+        verbose_name='Ключ дедупликации'
+    )
+    status = models.CharField(
+        max_length=7, choices=STATUSES, default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попытки'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=5, verbose_name='Максимум попыток'
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Время запуска'
+    )
+    locked_by = models.CharField(
+        max_length=100, blank=True, verbose_name='Обработчик'
+    )
+    locked_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Время захвата'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Время создания'
+    )
+
+    class Meta:
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ('run_at', 'id')
+        indexes = [
+            models.Index(fields=('status', 'run_at'),
+                         name='job_status_run_at'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=('dedup_key',),
+                condition=models.Q(status='pending'),
+                name='job_pending_dedup_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.id}: {self.name} ({self.status})'
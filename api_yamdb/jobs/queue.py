@@ -0,0 +1,120 @@
+"""Очередь задач в базе данных.
+
+Задача записывается в текущей транзакции, поэтому обработчики видят её
+только после фиксации изменений, ради которых она создана. Обработчики
+захватывают задачи условным ``UPDATE`` по статусу: задачу получает
+только один из них, и это работает на любой базе, включая SQLite.
+"""
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.models import Job
+
+CLAIM_BATCH = 10
+STALE_ERROR = 'Обработчик не завершил задачу за JOBS_LOCK_TIMEOUT.'
+
+registry = {}
+
+
+def enqueue(name, kwargs, dedup_key=None, run_at=None, max_attempts=5):
+    """Ставит задачу в очередь и возвращает её.
+
+    Если ожидающая задача с тем же ``dedup_key`` уже есть, новая не
+    создаётся и возвращается существующая. При ``JOBS_EAGER`` задача
+    выполняется сразу после фиксации транзакции.
+    """
+    if settings.JOBS_EAGER:
+        transaction.on_commit(lambda: registry[name](**kwargs))
+        return None
+    job = Job(
+        name=name, kwargs=kwargs, dedup_key=dedup_key,
+        max_attempts=max_attempts, run_at=run_at or timezone.now(),
+    )
+    if dedup_key is None:
+        job.save()
+        return job
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        return Job.objects.filter(
+            dedup_key=dedup_key, status=Job.PENDING
+        ).first()
+    return job
+
+
+def claim(worker):
+    """Захватывает ближайшую готовую задачу или возвращает ``None``."""
+    now = timezone.now()
+    ready = Job.objects.filter(
+        status=Job.PENDING, run_at__lte=now
+    ).values_list('pk', flat=True)
+    for pk in ready[:CLAIM_BATCH]:
+        claimed = Job.objects.filter(pk=pk, status=Job.PENDING).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run(job):
+    """Выполняет задачу: удаляет её при успехе, иначе вызывает ``fail``."""
+    try:
+        func = registry.get(job.name)
+        if func is None:
+            raise LookupError(f'Задача {job.name} не зарегистрирована.')
+        func(**job.kwargs)
+    except Exception:
+        fail(job, traceback.format_exc())
+        return False
+    job.delete()
+    return True
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(
+        settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.JOBS_MAX_RETRY_DELAY,
+    ))
+
+
+def fail(job, error):
+    """Откладывает повтор задачи с экспоненциальной задержкой.
+
+    После ``max_attempts`` попыток задача получает статус ``failed``.
+    Если за это время поставлена задача с тем же ``dedup_key``, повтор
+    не нужен и задача удаляется.
+    """
+    job.last_error = error
+    job.locked_by = ''
+    job.locked_at = None
+    if job.attempts >= job.max_attempts:
+        job.status = Job.FAILED
+        job.save()
+        return
+    job.status = Job.PENDING
+    job.run_at = timezone.now() + retry_delay(job.attempts)
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        job.delete()
+
+
+def release_stale(worker):
+    """Возвращает в очередь задачи обработчиков, которые не завершились."""
+    deadline = timezone.now() - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=deadline)
+    for job in stale:
+        taken = Job.objects.filter(
+            pk=job.pk, status=Job.RUNNING, locked_at=job.locked_at
+        ).update(locked_by=worker)
+        if taken:
+            fail(job, STALE_ERROR)
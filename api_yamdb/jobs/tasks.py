@@ -0,0 +1,25 @@
+"""Регистрация задач.
+
+Функция, обёрнутая в ``task``, регистрируется под именем
+``<модуль>.<функция>`` и получает метод ``enqueue``. Аргументы задачи
+передаются именованными и должны сериализоваться в JSON.
+"""
+from jobs import queue
+
+
+def task(func=None, *, max_attempts=5):
+    def decorate(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+        queue.registry[name] = func
+
+        def enqueue(dedup_key=None, run_at=None, **kwargs):
+            return queue.enqueue(
+                name, kwargs, dedup_key=dedup_key, run_at=run_at,
+                max_attempts=max_attempts,
+            )
+
+        func.job_name = name
+        func.enqueue = enqueue
+        return func
+
+    return decorate if func is None else decorate(func)
@@ -0,0 +1,50 @@
+import os
+import signal
+import socket
+import time
+
+from django.db import close_old_connections
+
+from jobs import queue
+
+
+class Worker:
+    """Цикл обработки задач одного процесса.
+
+    По SIGTERM и SIGINT обработчик завершает текущую задачу и выходит.
+    При ``burst`` он выходит, когда готовых задач не осталось.
+    """
+
+    def __init__(self, sleep=1.0, burst=False):
+        self.sleep = sleep
+        self.burst = burst
+        self.stopping = False
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def run(self):
+        """Обрабатывает задачи и возвращает число выполненных попыток."""
+        name = f'{socket.gethostname()}:{os.getpid()}'
+        handlers = {
+            signum: signal.signal(signum, self.stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        processed = 0
+        try:
+            while not self.stopping:
+                close_old_connections()
+                job = queue.claim(name)
+                if job is not None:
+                    queue.run(job)
+                    processed += 1
+                    continue
+                queue.release_stale(name)
+                if self.burst:
+                    break
+                time.sleep(self.sleep)
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+            close_old_connections()
+        return processed
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Category, Genre, Review, ReviewComment, Title
+from .models import (Category, ChangeLog, Genre, Review, ReviewComment, Title,
+                     TitleRating)
 
 
 class ReviewAdmin(admin.ModelAdmin):
@@ -55,8 +56,42 @@ class TitleAdmin(admin.ModelAdmin):
     empty_value_display = 'empty'
 
 
+class TitleRatingAdmin(admin.ModelAdmin):
+    list_display = (
+        "title",
+        "category",
+        "votes",
+        "score_sum",
+        "weighted_rating",
+    )
+    list_select_related = ('title', 'category')
+
+
+class ChangeLogAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "model",
+        "object_id",
+        "action",
+        "changed_at",
+    )
+    list_filter = ('model', 'action')
+
+    # Журнал только дополняется: по его id клиенты продолжают синхронизацию.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Genre, GenreAdmin)
 admin.site.register(ReviewComment, ReviewCommentAdmin)
 admin.site.register(Review, ReviewAdmin)
 admin.site.register(Title, TitleAdmin)
+admin.site.register(TitleRating, TitleRatingAdmin)
+admin.site.register(ChangeLog, ChangeLogAdmin)
@@ -0,0 +1,152 @@
+"""Пересчёт денормализованных агрегатов произведений.
+
+К агрегатам относятся ``Title.reviews_count``, ``Review.comments_count``
+и строки ``TitleRating``. При обычной записи их обновляют обработчики
+сигналов. Удаление пользователя или произведения затрагивает много
+отзывов и комментариев (см. ``reviews.deletion``), поэтому внутри
+``defer_recompute`` обработчики не трогают агрегаты, а затронутые
+произведения пересчитывают задачи ``recompute_titles`` частями по
+``RECOMPUTE_CHUNK``.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
+
+from reviews.models import Review, ReviewComment, Title, TitleRating
+
+RECOMPUTE_CHUNK = 100
+RATING_FIELDS = ('votes', 'score_sum',
+                 *TitleRating.objects.score_counts())
+
+# Отправляется после пересчёта с аргументом ``title_ids``.
+aggregates_recomputed = Signal()
+
+
+class Deferred(threading.local):
+
+    def __init__(self):
+        self.depth = 0
+        self.title_ids = set()
+
+
+deferred = Deferred()
+
+
+def is_deferred():
+    return deferred.depth > 0
+
+
+@contextmanager
+def defer_recompute(title_ids=()):
+    """Откладывает пересчёт агрегатов до конца блока.
+
+    ``title_ids`` — произведения, агрегаты которых изменит блок. После
+    успешного выхода из внешнего блока для них ставятся задачи
+    ``recompute_titles``.
+    """
+    outermost = not deferred.depth
+    deferred.depth += 1
+    deferred.title_ids.update(title_ids)
+    try:
+        yield
+    finally:
+        deferred.depth -= 1
+        if outermost:
+            title_ids, deferred.title_ids = deferred.title_ids, set()
+    if outermost:
+        enqueue_recompute(title_ids)
+
+
+def enqueue_recompute(title_ids):
+    from reviews.tasks import recompute_titles
+
+    title_ids = sorted(title_ids)
+    for start in range(0, len(title_ids), RECOMPUTE_CHUNK):
+        recompute_titles.enqueue(
+            title_ids=title_ids[start:start + RECOMPUTE_CHUNK]
+        )
+
+
+def user_title_ids(users):
+    """Произведения, агрегаты которых меняются при удалении ``users``."""
+    return set(
+        Review.objects.filter(author__in=users)
+        .values_list('title_id', flat=True)
+    ) | set(
+        ReviewComment.objects.filter(author__in=users)
+        .values_list('review__title_id', flat=True)
+    )
+
+
+def count_related(model, field):
+    return Coalesce(models.Subquery(
+        model.objects.filter(**{field: models.OuterRef('pk')})
+        .order_by().values(field)
+        .annotate(count=models.Count('pk')).values('count')
+    ), 0)
+
+
+def recompute(title_ids):
+    """Пересчитывает агрегаты произведений по отзывам и комментариям."""
+    with transaction.atomic():
+        titles = Title.objects.filter(pk__in=title_ids)
+        titles.update(reviews_count=count_related(Review, 'title'))
+        Review.objects.filter(title_id__in=title_ids).update(
+            comments_count=count_related(ReviewComment, 'review')
+        )
+        existing = list(titles.values_list('pk', flat=True))
+        for title_id in existing:
+            TitleRating.objects.refresh_title(title_id)
+    aggregates_recomputed.send(sender=Title, title_ids=existing)
+
+
+def find_mismatches():
+    """Произведения, чьи сохранённые агрегаты расходятся с исходными.
+
+    Возвращает словарь ``{агрегат: множество id произведений}``.
+    Взвешенный рейтинг не проверяется: он зависит от априорного среднего
+    и пересчитывается командой ``refresh_leaderboard``.
+    """
+    mismatches = {
+        'reviews_count': set(
+            Title.objects
+            .annotate(actual=count_related(Review, 'title'))
+            .exclude(reviews_count=models.F('actual'))
+            .values_list('pk', flat=True)
+        ),
+        'comments_count': set(
+            Review.objects
+            .annotate(actual=count_related(ReviewComment, 'review'))
+            .exclude(comments_count=models.F('actual'))
+            .values_list('title_id', flat=True)
+        ),
+    }
+    expected = {
+        row.pop('title_id'): row
+        for row in Review.objects.order_by().values('title_id').annotate(
+            votes=models.Count('id'), score_sum=models.Sum('score'),
+            **TitleRating.objects.score_counts()
+        ).values('title_id', 'title__category_id', *RATING_FIELDS)
+    }
+    ratings = {
+        row.pop('title_id'): row
+        for row in TitleRating.objects.values(
+            'title_id', 'category_id', *RATING_FIELDS
+        )
+    }
+    mismatches['rating'] = {
+        title_id
+        for title_id in expected.keys() | ratings.keys()
+        if not _rating_matches(expected.get(title_id), ratings.get(title_id))
+    }
+    return mismatches
+
+
+def _rating_matches(expected, rating):
+    if expected is None or rating is None:
+        return expected is None and rating is None
+    category_id = expected.pop('title__category_id')
+    return rating.pop('category_id') == category_id and rating == expected
@@ -0,0 +1,148 @@
+"""Мягкое удаление произведений и пользователей.
+
+Каскадное удаление популярного произведения или активного пользователя
+держит блокировку записи SQLite, пока удаляются все его отзывы и
+комментарии. Поэтому удаление только проставляет ``deleted_at``: менеджеры
+моделей скрывают такие строки вместе со всем, что от них зависит, а задачи
+``purge_title`` и ``purge_user`` потом удаляют зависимые строки
+транзакциями по ``PURGE_BATCH``. Скрытые строки попадают в журнал
+изменений при скрытии, поэтому удаление внутри ``is_purging`` в журнал
+не пишется.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db import models, transaction
+from django.db.models.functions import Cast, Concat
+from django.dispatch import Signal
+from django.utils import timezone
+
+from reviews.aggregates import defer_recompute, user_title_ids
+from reviews.models import (GenreTitle, Review, ReviewComment, Title,
+                            TitleRating)
+from users.models import User
+
+PURGE_BATCH = 100
+
+# Отправляется в транзакции мягкого удаления с аргументом ``pks``.
+soft_deleted = Signal()
+
+purging = threading.local()
+
+
+def is_purging():
+    return getattr(purging, 'active', False)
+
+
+@contextmanager
+def purge():
+    """Удаление уже скрытых строк."""
+    active, purging.active = is_purging(), True
+    try:
+        yield
+    finally:
+        purging.active = active
+
+
+def deleted_label(*suffix):
+    """``deleted:<id>`` освобождает уникальные логин и почту."""
+    return Concat(
+        models.Value('deleted:'), Cast('pk', models.CharField()),
+        *(models.Value(value) for value in suffix),
+    )
+
+
+def soft_delete_titles(queryset):
+    """Скрывает произведения и ставит задачи удаления их строк."""
+    from reviews.tasks import purge_title
+
+    with transaction.atomic():
+        pks = list(queryset.filter(deleted_at__isnull=True)
+                   .values_list('pk', flat=True))
+        if not pks:
+            return 0, {}
+        Title._base_manager.filter(pk__in=pks).update(
+            deleted_at=timezone.now()
+        )
+        TitleRating.objects.filter(title_id__in=pks).delete()
+        soft_deleted.send(sender=Title, pks=pks)
+        for pk in pks:
+            purge_title.enqueue(title_id=pk, dedup_key=f'purge_title:{pk}')
+    return len(pks), {Title._meta.label: len(pks)}
+
+
+def soft_delete_users(queryset):
+    """Скрывает пользователей с их отзывами и комментариями.
+
+    Агрегаты затронутых произведений пересчитываются без строк этих
+    пользователей сразу, не дожидаясь удаления строк.
+    """
+    from reviews.tasks import purge_user
+
+    with transaction.atomic():
+        pks = list(queryset.filter(deleted_at__isnull=True)
+                   .values_list('pk', flat=True))
+        if not pks:
+            return 0, {}
+        with defer_recompute(user_title_ids(pks)):
+            User._base_manager.filter(pk__in=pks).update(
+                deleted_at=timezone.now(), is_active=False,
+                username=deleted_label(),
+                email=deleted_label('@invalid'),
+            )
+        soft_deleted.send(sender=User, pks=pks)
+        for pk in pks:
+            purge_user.enqueue(user_id=pk, dedup_key=f'purge_user:{pk}')
+    return len(pks), {User._meta.label: len(pks)}
+
+
+def title_reviews(pks):
+    """Отзывы, скрытые вместе с произведениями ``pks``."""
+    return Review._base_manager.filter(title_id__in=pks)
+
+
+def title_comments(pks):
+    """Комментарии, скрытые вместе с произведениями ``pks``."""
+    return ReviewComment._base_manager.filter(review__title_id__in=pks)
+
+
+def user_comments(pks):
+    """Комментарии, скрытые вместе с пользователями ``pks``."""
+    return ReviewComment._base_manager.filter(
+        models.Q(author_id__in=pks) | models.Q(review__author_id__in=pks)
+    )
+
+
+def delete_in_batches(queryset):
+    """Удаляет строки ``queryset`` транзакциями по ``PURGE_BATCH``.
+
+    Агрегаты не трогаются: строки уже скрыты и исключены из них.
+    """
+    model = queryset.model
+    while True:
+        with transaction.atomic(), defer_recompute():
+            pks = list(queryset.values_list('pk', flat=True)[:PURGE_BATCH])
+            if not pks:
+                return
+            model._base_manager.filter(pk__in=pks).delete()
+
+
+def purge_title(title_id):
+    if not Title._base_manager.filter(
+            pk=title_id, deleted_at__isnull=False).exists():
+        return
+    with purge():
+        delete_in_batches(title_comments([title_id]))
+        delete_in_batches(title_reviews([title_id]))
+        delete_in_batches(GenreTitle._base_manager.filter(title_id=title_id))
+        Title._base_manager.filter(pk=title_id).delete()
+
+
+def purge_user(user_id):
+    if not User._base_manager.filter(
+            pk=user_id, deleted_at__isnull=False).exists():
+        return
+    with purge():
+        delete_in_batches(user_comments([user_id]))
+        delete_in_batches(Review._base_manager.filter(author_id=user_id))
+        User._base_manager.filter(pk=user_id).delete()
@@ -0,0 +1,34 @@
+from django.core.management import BaseCommand, CommandError
+
+from reviews.aggregates import RECOMPUTE_CHUNK, find_mismatches, recompute
+
+PREVIEW = 10
+
+
+class Command(BaseCommand):
+    help = ('Сверяет счётчики и рейтинги произведений с отзывами '
+            'и комментариями.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix', action='store_true',
+            help='Пересчитать агрегаты произведений с расхождениями.'
+        )
+
+    def handle(self, *args, fix, **kwargs):
+        mismatches = find_mismatches()
+        title_ids = sorted(set().union(*mismatches.values()))
+        if not title_ids:
+            self.stdout.write('Расхождений не найдено')
+            return
+        for name, ids in mismatches.items():
+            if ids:
+                preview = ', '.join(map(str, sorted(ids)[:PREVIEW]))
+                self.stdout.write(f'{name}: {len(ids)} ({preview})')
+        if not fix:
+            raise CommandError(
+                f'Агрегаты расходятся у произведений: {len(title_ids)}'
+            )
+        for start in range(0, len(title_ids), RECOMPUTE_CHUNK):
+            recompute(title_ids[start:start + RECOMPUTE_CHUNK])
+        self.stdout.write(f'Агрегаты пересчитаны: {len(title_ids)}')
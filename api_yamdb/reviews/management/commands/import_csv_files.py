@@ -2,6 +2,8 @@ import csv
 
 from django.conf import settings
 from django.core.management import BaseCommand
+
+from api.versions import reset_versions
 from reviews.models import (
     Category, Genre, Review, ReviewComment, Title, User, GenreTitle
 )
@@ -37,4 +39,6 @@ class Command(BaseCommand):
                 else:
                     model.objects.bulk_create(
                         [model(**data) for data in reader])
+        # bulk_create() не отправляет сигналы, поэтому кеши сбрасываются явно.
+        reset_versions()
         self.stdout.write(('Данные csv-файлов импортированы'))
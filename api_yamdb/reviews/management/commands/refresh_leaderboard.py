@@ -0,0 +1,11 @@
+from django.core.management import BaseCommand
+
+from reviews.models import TitleRating
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает взвешенные рейтинги произведений.'
+
+    def handle(self, *args, **kwargs):
+        TitleRating.objects.refresh_all()
+        self.stdout.write('Рейтинги произведений пересчитаны')
@@ -0,0 +1,60 @@
+# Generated by Django 3.2 on 2026-10-19 14:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_ratings(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleRating = apps.get_model('reviews', 'TitleRating')
+    rows = list(
+        Review.objects.values('title_id')
+        .annotate(votes=models.Count('id'), score_sum=models.Sum('score'))
+        .values_list('title_id', 'title__category_id', 'votes', 'score_sum')
+    )
+    votes = sum(row[2] for row in rows)
+    prior = sum(row[3] for row in rows) / votes if votes else 0.0
+    min_votes = settings.LEADERBOARD_MIN_VOTES
+    TitleRating.objects.bulk_create(
+        [
+            TitleRating(
+                title_id=title_id, category_id=category_id, votes=votes,
+                score_sum=score_sum,
+                weighted_rating=(
+                    (score_sum + min_votes * prior) / (votes + min_votes)
+                ),
+            )
+            for title_id, category_id, votes, score_sum in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRating',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_stats', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('votes', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('score_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('weighted_rating', models.FloatField(db_index=True, default=0, verbose_name='Взвешенный рейтинг')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reviews.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг произведения',
+                'verbose_name_plural': 'Рейтинги произведений',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titlerating',
+            index=models.Index(fields=['category', '-weighted_rating'], name='titlerating_category_rating'),
+        ),
+        migrations.RunPython(populate_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 3.2 on 2026-10-19 14:50
+
+from django.db import migrations, models
+
+
+def populate_histograms(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleRating = apps.get_model('reviews', 'TitleRating')
+    counts = {
+        f'score_{score}': models.Count('id', filter=models.Q(score=score))
+        for score in range(1, 11)
+    }
+    rows = (
+        Review.objects.values('title_id').annotate(**counts)
+        .values('title_id', *counts)
+    )
+    for row in rows:
+        TitleRating.objects.filter(title_id=row.pop('title_id')).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_titlerating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='titlerating',
+            name='score_1',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 1'),
+        ),
+        migrations.AddField(
+            model_name='titlerating',
+            name='score_10',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 10'),
+        ),
+        migrations.AddField(
+            model_name='titlerating',
+            name='score_2',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 2'),
+        ),
+        migrations.AddField(
+            model_name='titlerating',
+            name='score_3',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 3'),
+        ),
+        migrations.AddField(
+            model_name='titlerating',
+            name='score_4',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 4'),
+        ),
+        migrations.AddField(
+            model_name='titlerating',
+            name='score_5',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 5'),
+        ),
+        migrations.AddField(
+            model_name='titlerating',
+            name='score_6',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 6'),
+        ),
+        migrations.AddField(
+            model_name='titlerating',
+            name='score_7',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 7'),
+        ),
+        migrations.AddField(
+            model_name='titlerating',
+            name='score_8',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 8'),
+        ),
+        migrations.AddField(
+            model_name='titlerating',
+            name='score_9',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 9'),
+        ),
+        migrations.RunPython(populate_histograms, migrations.RunPython.noop),
+    ]
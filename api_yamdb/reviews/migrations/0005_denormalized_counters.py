@@ -0,0 +1,43 @@
+# Generated by Django 3.2 on 2026-10-19 14:51
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_related(model, field):
+    return Coalesce(models.Subquery(
+        model.objects.filter(**{field: models.OuterRef('pk')})
+        .order_by().values(field)
+        .annotate(count=models.Count('pk')).values('count')
+    ), 0)
+
+
+def populate_counters(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    ReviewComment = apps.get_model('reviews', 'ReviewComment')
+    Title.objects.update(reviews_count=count_related(Review, 'title'))
+    Review.objects.update(
+        comments_count=count_related(ReviewComment, 'review')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_titlerating_histogram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
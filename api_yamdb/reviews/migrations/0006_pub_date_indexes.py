@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-19 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'pub_date', 'id'], name='review_title_pub_date'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewcomment',
+            index=models.Index(fields=['review', 'pub_date', 'id'], name='comment_review_pub_date'),
+        ),
+    ]
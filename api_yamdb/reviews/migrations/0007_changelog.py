@@ -0,0 +1,28 @@
+# Generated by Django 3.2 on 2026-10-19 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('title', 'Произведение'), ('review', 'Отзыв'), ('comment', 'Комментарий'), ('genre', 'Жанр'), ('category', 'Категория')], max_length=20, verbose_name='Модель')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Id объекта')),
+                ('action', models.CharField(choices=[('created', 'Создание'), ('updated', 'Изменение'), ('deleted', 'Удаление')], max_length=7, verbose_name='Действие')),
+                ('changed_at', models.DateTimeField(auto_now_add=True, verbose_name='Время изменения')),
+            ],
+            options={
+                'verbose_name': 'Изменение',
+                'verbose_name_plural': 'Журнал изменений',
+                'ordering': ('id',),
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-19 15:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_changelog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Дата удаления'),
+        ),
+    ]
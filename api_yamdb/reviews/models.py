@@ -1,5 +1,9 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.expressions import RawSQL, Window
+from django.db.models.functions import RowNumber
 
 from users.models import User
 from reviews.validators import current_year
@@ -7,6 +11,27 @@ from reviews.validators import current_year
 USERNAME_LENGTH = 150
 EMAIL_LENGTH = 254
 MIN_YEAR = 0
+PRIOR_MEAN_KEY = 'leaderboard:prior_mean'
+SCORES = range(1, 11)
+
+
+class CounterFieldsMixin:
+    """Не затирает денормализованные счётчики при сохранении объекта.
+
+    Счётчики из ``counter_fields`` меняются только выражениями ``F()``,
+    поэтому при обновлении сохраняются все поля, кроме них.
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None and not self._state.adding:
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+            ]
+        super().save(*args, update_fields=update_fields, **kwargs)
 
 
 class Genre(models.Model):
@@ -39,7 +64,29 @@ class Category(models.Model):
         return self.name
 
 
-class Title(models.Model):
+class TitleQuerySet(models.QuerySet):
+
+    def with_rating(self):
+        """Средняя оценка без отзывов удалённых пользователей."""
+        return self.annotate(rating=models.Avg(
+            'reviews__score',
+            filter=models.Q(reviews__author__deleted_at__isnull=True),
+        ))
+
+    def delete(self):
+        from reviews.deletion import soft_delete_titles
+
+        return soft_delete_titles(self)
+
+
+class TitleManager(models.Manager.from_queryset(TitleQuerySet)):
+    """Произведения без мягко удалённых."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class Title(CounterFieldsMixin, models.Model):
     name = models.CharField(
         max_length=200, verbose_name='Название'
     )
@@ -63,6 +110,17 @@ class Title(models.Model):
         on_delete=models.SET_NULL, verbose_name='Категория',
         related_name='titles'
     )
+    reviews_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество отзывов'
+    )
+    deleted_at = models.DateTimeField(
+        null=True, blank=True, editable=False, db_index=True,
+        verbose_name='Дата удаления'
+    )
+
+    counter_fields = ('reviews_count',)
+
+    objects = TitleManager()
 
     class Meta:
         verbose_name = 'Произведение'
@@ -71,8 +129,80 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    def delete(self, *args, **kwargs):
+        # Строки произведения удаляет фоновая задача, см. reviews.deletion.
+        from reviews.deletion import soft_delete_titles
+
+        return soft_delete_titles(Title._base_manager.filter(pk=self.pk))
+
+
+class ReviewQuerySet(models.QuerySet):
+
+    def latest_per_title(self, title_ids, count):
+        """Не больше ``count`` новых отзывов каждого произведения.
+
+        Отзывы нумеруются оконной функцией внутри произведения, и всё
+        выбирается одним запросом.
+        """
+        ranked = (
+            Review.objects.filter(title_id__in=title_ids)
+            .annotate(review_rank=Window(
+                RowNumber(),
+                partition_by=[models.F('title_id')],
+                order_by=[models.F('pub_date').desc(), models.F('id').desc()],
+            ))
+            .values('id', 'review_rank')
+        )
+        sql, params = ranked.query.sql_with_params()
+        return self.filter(pk__in=RawSQL(
+            f'SELECT id FROM ({sql}) ranked WHERE review_rank <= %s',
+            (*params, count),
+        )).order_by('title_id', '-pub_date', '-id')
+
+
+class ReviewManager(models.Manager.from_queryset(ReviewQuerySet)):
+    """Отзывы без удалённых произведений и авторов."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            title__deleted_at__isnull=True, author__deleted_at__isnull=True
+        )
 
-class Review(models.Model):
+    def of_title(self, title):
+        """Отзывы уже найденного произведения.
+
+        Произведение не удалено, поэтому проверяется только автор, и
+        запрос не соединяется с таблицей произведений.
+        """
+        return super().get_queryset().filter(
+            title=title, author__deleted_at__isnull=True
+        )
+
+
+class ReviewCommentManager(models.Manager):
+    """Комментарии без удалённых авторов, отзывов и произведений."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            author__deleted_at__isnull=True,
+            review__author__deleted_at__isnull=True,
+            review__title__deleted_at__isnull=True,
+        )
+
+    def of_review(self, review):
+        """Комментарии уже найденного отзыва, проверяется только автор."""
+        return super().get_queryset().filter(
+            review=review, author__deleted_at__isnull=True
+        )
+
+
+class GenreTitleManager(models.Manager):
+
+    def get_queryset(self):
+        return super().get_queryset().filter(title__deleted_at__isnull=True)
+
+
+class Review(CounterFieldsMixin, models.Model):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -97,6 +227,13 @@ class Review(models.Model):
             MinValueValidator(1), MaxValueValidator(10)
         ],
     )
+    comments_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество комментариев'
+    )
+
+    objects = ReviewManager()
+
+    counter_fields = ('comments_count',)
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -106,6 +243,12 @@ class Review(models.Model):
                 fields=['author', 'title'], name='unique_together'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date',
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -131,9 +274,17 @@ class ReviewComment(models.Model):
     pub_date = models.DateTimeField(
         verbose_name='Дата добавления', auto_now_add=True, db_index=True)
 
+    objects = ReviewCommentManager()
+
     class Meta:
         verbose_name = 'Комментарий к отзыву'
         verbose_name_plural = 'Комментарии к отзывам'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date',
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -148,9 +299,257 @@ class GenreTitle(models.Model):
     genre = models.ForeignKey(
         Genre, on_delete=models.CASCADE, verbose_name='Жанры')
 
+    objects = GenreTitleManager()
+
     def __str__(self):
         return f'{self.title} {self.genre}'
 
     class Meta:
         verbose_name = 'Жанр'
         verbose_name_plural = 'Жанры'
+
+
+class TitleRatingManager(models.Manager):
+
+    def prior_mean(self):
+        """Средняя оценка по всем отзывам — априорное среднее рейтинга.
+
+        Значение запоминается в кеше до следующего ``refresh_all``, чтобы
+        все строки таблицы считались с одним и тем же средним.
+        """
+        prior = cache.get(PRIOR_MEAN_KEY)
+        if prior is None:
+            totals = self.aggregate(
+                votes=models.Sum('votes'), score_sum=models.Sum('score_sum')
+            )
+            if not totals['votes']:
+                return 0.0
+            prior = totals['score_sum'] / totals['votes']
+            cache.set(PRIOR_MEAN_KEY, prior, None)
+        return prior
+
+    def weighted(self, votes, score_sum, prior):
+        min_votes = settings.LEADERBOARD_MIN_VOTES
+        return (score_sum + min_votes * prior) / (votes + min_votes)
+
+    def score_counts(self):
+        """Агрегаты ``Review`` для счётчиков ``score_1`` … ``score_10``."""
+        return {
+            f'score_{score}': models.Count('id', filter=models.Q(score=score))
+            for score in SCORES
+        }
+
+    def change_scores(self, title_id, added=None, removed=None):
+        """Учитывает добавленную и убранную оценки в строке произведения.
+
+        Счётчики меняются через ``F()`` в текущей транзакции, поэтому
+        распределение оценок обновляется вместе с отзывом. Взвешенный
+        рейтинг новой строки считается сразу, существующей — отложенной
+        задачей ``refresh_weighted``.
+        """
+        votes = score_sum = 0
+        changes = {}
+        for score, delta in ((added, 1), (removed, -1)):
+            if score is not None:
+                votes += delta
+                score_sum += delta * score
+                changes[f'score_{score}'] = models.F(f'score_{score}') + delta
+        changes.update(votes=models.F('votes') + votes,
+                       score_sum=models.F('score_sum') + score_sum)
+        if self.filter(title_id=title_id).update(**changes):
+            if votes < 0:
+                self.filter(title_id=title_id, votes=0).delete()
+            return
+        if removed is not None:
+            return
+        category_id = (
+            Title.objects.filter(pk=title_id)
+            .values_list('category_id', flat=True).first()
+        )
+        try:
+            with transaction.atomic():
+                self.create(
+                    title_id=title_id, category_id=category_id, votes=1,
+                    score_sum=added, **{f'score_{added}': 1},
+                    weighted_rating=self.weighted(1, added, self.prior_mean()),
+                )
+        except IntegrityError:
+            # Строку успел создать параллельный запрос.
+            self.filter(title_id=title_id).update(**changes)
+
+    def refresh_weighted(self, title_id):
+        """Пересчитывает взвешенный рейтинг по счётчикам строки."""
+        rating = self.filter(title_id=title_id).first()
+        if rating is not None:
+            rating.weighted_rating = self.weighted(
+                rating.votes, rating.score_sum, self.prior_mean()
+            )
+            rating.save(update_fields=['weighted_rating'])
+
+    def refresh_title(self, title_id):
+        """Пересчитывает строку одного произведения по его отзывам."""
+        totals = Review.objects.filter(title_id=title_id).aggregate(
+            votes=models.Count('id'), score_sum=models.Sum('score'),
+            **self.score_counts()
+        )
+        if not totals['votes']:
+            self.filter(title_id=title_id).delete()
+            return
+        category_id = (
+            Title.objects.filter(pk=title_id)
+            .values_list('category_id', flat=True).first()
+        )
+        self.update_or_create(title_id=title_id, defaults=dict(
+            totals,
+            category_id=category_id,
+            weighted_rating=self.weighted(
+                totals['votes'], totals['score_sum'], self.prior_mean()
+            ),
+        ))
+
+    def refresh_all(self):
+        """Пересчитывает все строки с новым априорным средним."""
+        rows = (
+            Review.objects.values('title_id')
+            .annotate(votes=models.Count('id'), score_sum=models.Sum('score'),
+                      **self.score_counts())
+            .values('title_id', 'title__category_id', 'votes', 'score_sum',
+                    *self.score_counts())
+        )
+        totals = [0, 0]
+        ratings = []
+        for row in rows:
+            totals[0] += row['votes']
+            totals[1] += row['score_sum']
+            row['category_id'] = row.pop('title__category_id')
+            ratings.append(self.model(**row))
+        prior = totals[1] / totals[0] if totals[0] else 0.0
+        for rating in ratings:
+            rating.weighted_rating = self.weighted(
+                rating.votes, rating.score_sum, prior
+            )
+        self.all().delete()
+        self.bulk_create(ratings, batch_size=500)
+        cache.set(PRIOR_MEAN_KEY, prior, None)
+
+
+class TitleRating(models.Model):
+    """Рейтинг произведения для лидербордов.
+
+    Средневзвешенная по Байесу оценка хранится с индексами, поэтому
+    выборка лучших произведений — это просмотр диапазона индекса.
+    Поля ``score_1`` … ``score_10`` — распределение оценок произведения.
+    """
+
+    title = models.OneToOneField(
+        Title, on_delete=models.CASCADE, primary_key=True,
+        related_name='rating_stats', verbose_name='Произведение'
+    )
+    category = models.ForeignKey(
+        Category, blank=True, null=True, on_delete=models.SET_NULL,
+        related_name='+', verbose_name='Категория'
+    )
+    votes = models.PositiveIntegerField(
+        default=0, verbose_name='Количество оценок'
+    )
+    score_sum = models.PositiveIntegerField(
+        default=0, verbose_name='Сумма оценок'
+    )
+    weighted_rating = models.FloatField(
+        default=0, db_index=True, verbose_name='Взвешенный рейтинг'
+    )
+    score_1 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 1'
+    )
+    score_2 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 2'
+    )
+    score_3 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 3'
+    )
+    score_4 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 4'
+    )
+    score_5 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 5'
+    )
+    score_6 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 6'
+    )
+    score_7 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 7'
+    )
+    score_8 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 8'
+    )
+    score_9 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 9'
+    )
+    score_10 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 10'
+    )
+
+    objects = TitleRatingManager()
+
+    class Meta:
+        verbose_name = 'Рейтинг произведения'
+        verbose_name_plural = 'Рейтинги произведений'
+        indexes = [
+            models.Index(
+                fields=['category', '-weighted_rating'],
+                name='titlerating_category_rating',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.weighted_rating:.2f}'
+
+    @property
+    def histogram(self):
+        """Число оценок по значениям от 1 до 10."""
+        return {
+            str(score): getattr(self, f'score_{score}') for score in SCORES
+        }
+
+
+class ChangeLog(models.Model):
+    """Журнал изменений справочников, произведений, отзывов и комментариев.
+
+    Записи только добавляются; ``id`` записи служит курсором
+    синхронизации клиентов.
+    """
+
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTIONS = (
+        (CREATED, 'Создание'),
+        (UPDATED, 'Изменение'),
+        (DELETED, 'Удаление'),
+    )
+    MODELS = (
+        ('title', 'Произведение'),
+        ('review', 'Отзыв'),
+        ('comment', 'Комментарий'),
+        ('genre', 'Жанр'),
+        ('category', 'Категория'),
+    )
+
+    model = models.CharField(
+        max_length=20, choices=MODELS, verbose_name='Модель'
+    )
+    object_id = models.PositiveIntegerField(verbose_name='Id объекта')
+    action = models.CharField(
+        max_length=7, choices=ACTIONS, verbose_name='Действие'
+    )
+    changed_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Время изменения'
+    )
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.id}: {self.action} {self.model} {self.object_id}'
@@ -0,0 +1,195 @@
+from django.db.models import F
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save)
+from django.dispatch import receiver
+
+from reviews import aggregates
+from reviews.deletion import (is_purging, soft_deleted, title_comments,
+                              title_reviews, user_comments)
+from reviews.models import (Category, ChangeLog, Genre, GenreTitle, Review,
+                            ReviewComment, Title, TitleRating)
+from reviews.tasks import refresh_weighted_rating
+from users.models import User
+from users.signals import username_changed
+
+LOGGED_MODELS = {
+    Title: 'title',
+    Review: 'review',
+    ReviewComment: 'comment',
+    Genre: 'genre',
+    Category: 'category',
+}
+
+
+def change_counter(queryset, field, delta):
+    queryset.update(**{field: F(field) + delta})
+
+
+@receiver(post_save, sender=Review)
+def review_created(sender, instance, created, **kwargs):
+    if created:
+        change_counter(
+            Title.objects.filter(pk=instance.title_id), 'reviews_count', 1
+        )
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    if aggregates.is_deferred():
+        return
+    change_counter(
+        Title.objects.filter(pk=instance.title_id), 'reviews_count', -1
+    )
+    TitleRating.objects.change_scores(instance.title_id,
+                                      removed=instance.score)
+    refresh_rating(instance.title_id)
+
+
+@receiver(post_save, sender=ReviewComment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        change_counter(
+            Review.objects.filter(pk=instance.review_id), 'comments_count', 1
+        )
+
+
+@receiver(post_delete, sender=ReviewComment)
+def comment_deleted(sender, instance, **kwargs):
+    if aggregates.is_deferred():
+        return
+    change_counter(
+        Review.objects.filter(pk=instance.review_id), 'comments_count', -1
+    )
+
+
+def refresh_rating(title_id):
+    refresh_weighted_rating.enqueue(
+        title_id=title_id, dedup_key=f'title_rating:{title_id}'
+    )
+
+
+@receiver(post_init, sender=Review)
+def remember_score(sender, instance, **kwargs):
+    instance._saved_score = instance.__dict__.get('score')
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    saved, instance._saved_score = instance._saved_score, instance.score
+    if created:
+        TitleRating.objects.change_scores(instance.title_id,
+                                          added=instance.score)
+    elif saved is None:
+        # Прежняя оценка не загружалась, строка пересчитывается целиком.
+        TitleRating.objects.refresh_title(instance.title_id)
+        return
+    elif saved != instance.score:
+        TitleRating.objects.change_scores(
+            instance.title_id, added=instance.score, removed=saved
+        )
+    else:
+        return
+    refresh_rating(instance.title_id)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, **kwargs):
+    if not created:
+        TitleRating.objects.filter(title_id=instance.pk).update(
+            category_id=instance.category_id
+        )
+
+
+def log_changes(model, action, *object_ids):
+    ChangeLog.objects.bulk_create([
+        ChangeLog(model=model, object_id=pk, action=action)
+        for pk in object_ids
+    ])
+
+
+@receiver(post_save)
+def log_saved(sender, instance, created, raw=False, **kwargs):
+    model = LOGGED_MODELS.get(sender)
+    if model is None or raw:
+        return
+    log_changes(
+        model, ChangeLog.CREATED if created else ChangeLog.UPDATED,
+        instance.pk
+    )
+    # Рейтинг и счётчики родителя входят в его представление.
+    if sender is Review:
+        log_changes('title', ChangeLog.UPDATED, instance.title_id)
+    elif sender is ReviewComment and created:
+        log_changes('review', ChangeLog.UPDATED, instance.review_id)
+
+
+@receiver(post_delete)
+def log_deleted(sender, instance, **kwargs):
+    model = LOGGED_MODELS.get(sender)
+    # Скрытые мягким удалением строки попали в журнал при скрытии.
+    if model is None or is_purging():
+        return
+    if getattr(instance, 'deleted_at', None) is None:
+        log_changes(model, ChangeLog.DELETED, instance.pk)
+    if sender is Review:
+        log_changes('title', ChangeLog.UPDATED, instance.title_id)
+    elif sender is ReviewComment:
+        log_changes('review', ChangeLog.UPDATED, instance.review_id)
+
+
+@receiver(soft_deleted, sender=Title)
+def log_titles_hidden(sender, pks, **kwargs):
+    log_changes('title', ChangeLog.DELETED, *pks)
+    log_changes('review', ChangeLog.DELETED, *title_reviews(
+        pks
+    ).values_list('pk', flat=True))
+    log_changes('comment', ChangeLog.DELETED, *title_comments(
+        pks
+    ).values_list('pk', flat=True))
+
+
+@receiver(soft_deleted, sender=User)
+def log_users_hidden(sender, pks, **kwargs):
+    log_changes('review', ChangeLog.DELETED, *Review._base_manager.filter(
+        author_id__in=pks
+    ).values_list('pk', flat=True))
+    log_changes('comment', ChangeLog.DELETED, *user_comments(
+        pks
+    ).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def log_genre_title(sender, instance, **kwargs):
+    if not is_purging():
+        log_changes('title', ChangeLog.UPDATED, instance.title_id)
+
+
+@receiver(aggregates.aggregates_recomputed)
+def log_recomputed(sender, title_ids, **kwargs):
+    # Пересчёт обновляет счётчики через update() без сигналов моделей.
+    log_changes('title', ChangeLog.UPDATED, *title_ids)
+    log_changes('review', ChangeLog.UPDATED, *Review.objects.filter(
+        title_id__in=title_ids
+    ).values_list('pk', flat=True))
+
+
+@receiver(username_changed)
+def log_username_changed(sender, instance, **kwargs):
+    # Логин входит в данные отзывов и комментариев пользователя.
+    log_changes('review', ChangeLog.UPDATED, *Review.objects.filter(
+        author=instance
+    ).values_list('pk', flat=True))
+    log_changes('comment', ChangeLog.UPDATED, *ReviewComment.objects.filter(
+        author=instance
+    ).values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def log_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        log_changes('title', ChangeLog.UPDATED, instance.pk)
+    elif pk_set:
+        log_changes('title', ChangeLog.UPDATED, *sorted(pk_set))
@@ -0,0 +1,23 @@
+from jobs.tasks import task
+from reviews import aggregates, deletion
+from reviews.models import TitleRating
+
+
+@task
+def refresh_weighted_rating(title_id):
+    TitleRating.objects.refresh_weighted(title_id)
+
+
+@task
+def recompute_titles(title_ids):
+    aggregates.recompute(title_ids)
+
+
+@task
+def purge_title(title_id):
+    deletion.purge_title(title_id)
+
+
+@task
+def purge_user(user_id):
+    deletion.purge_user(user_id)
@@ -1,7 +1,23 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as BaseUserManager
 from django.db import models
 
 
+class UserQuerySet(models.QuerySet):
+
+    def delete(self):
+        from reviews.deletion import soft_delete_users
+
+        return soft_delete_users(self)
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    """Пользователи без мягко удалённых."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class User(AbstractUser):
     """Модель пользователя."""
 
@@ -56,6 +72,15 @@ class User(AbstractUser):
         blank=False,
         default='XXXXX'
     )
+    deleted_at = models.DateTimeField(
+        verbose_name='Дата удаления',
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
+
+    objects = UserManager()
 
     class Meta:
         ordering = ('id',)
@@ -65,6 +90,12 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    def delete(self, *args, **kwargs):
+        # Строки пользователя удаляет фоновая задача, см. reviews.deletion.
+        from reviews.deletion import soft_delete_users
+
+        return soft_delete_users(User._base_manager.filter(pk=self.pk))
+
     @property
     def is_admin(self):
         return self.role == self.ADMIN or self.is_superuser
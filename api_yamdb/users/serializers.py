@@ -2,14 +2,13 @@ import re
 
 import rest_framework.exceptions
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.core.validators import RegexValidator
 from django.db import IntegrityError
 from rest_framework import serializers
 
-from api_yamdb.settings import DEFAULT_FROM_EMAIL
 from reviews.models import EMAIL_LENGTH, USERNAME_LENGTH
 from users.models import User
+from users.tasks import send_confirmation_code
 from users.validators import validate_username
 
 
@@ -118,11 +117,8 @@ class SignUpSerializer(serializers.Serializer):
                 )
         user.confirmation_code = default_token_generator.make_token(user)
         user.save()
-        send_mail(
-            subject='Код подтверждения',
-            message=f'Ваш код подтверждения: {user.confirmation_code}',
-            from_email=DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email]
+        send_confirmation_code.enqueue(
+            user_id=user.pk, dedup_key=f'confirmation_code:{user.pk}'
         )
         return user
 
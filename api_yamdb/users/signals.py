@@ -0,0 +1,22 @@
+from django.db.models.signals import post_init, post_save
+from django.dispatch import Signal, receiver
+
+from users.models import User
+
+# Отправляется после сохранения пользователя с новым логином.
+username_changed = Signal()
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    # Отложенное поле не загружается ради сравнения.
+    instance._saved_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    saved, instance._saved_username = (
+        instance._saved_username, instance.username
+    )
+    if not created and instance.username != saved:
+        username_changed.send(sender=User, instance=instance)
@@ -0,0 +1,19 @@
+from django.core.mail import send_mail
+
+from api_yamdb.settings import DEFAULT_FROM_EMAIL
+from jobs.tasks import task
+from users.models import User
+
+
+@task
+def send_confirmation_code(user_id):
+    """Отправляет пользователю его текущий код подтверждения."""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    send_mail(
+        subject='Код подтверждения',
+        message=f'Ваш код подтверждения: {user.confirmation_code}',
+        from_email=DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email]
+    )
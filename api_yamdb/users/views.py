@@ -7,7 +7,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import AccessToken
 
+from api.mixins import SelectablePaginationMixin
+from api.pagination import (CachedCountLimitOffsetPagination,
+                            NoCountLimitOffsetPagination)
 from api.permissions import IsAdminOrIsSuperuser
+from api.versions import USERS
 from users.models import User
 from users.serializers import (SignUpSerializer, TokenSerializer,
                                UserCreateSerializer, UserDisplaySerializer)
@@ -33,13 +37,18 @@ class TokenView(APIView):
         )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SelectablePaginationMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
+    pagination_class = CachedCountLimitOffsetPagination
+    pagination_classes = {'nocount': NoCountLimitOffsetPagination}
     permission_classes = (IsAdminOrIsSuperuser,)
     lookup_field = 'username'
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
 
+    def get_version_scopes(self):
+        return (USERS,)
+
     def get_serializer_class(self):
         if self.request.method in permissions.SAFE_METHODS:
             return UserDisplaySerializer
@@ -0,0 +1,84 @@
+"""Пропускная способность GET-запросов через ASGI.
+
+Сравнивается стандартный ``ASGIHandler``, выполняющий синхронные
+представления в одном общем потоке, и ``AsyncViewASGIHandler`` с пулом
+потоков для чтения. Задержка ответа базы моделируется паузой на каждый
+SQL-запрос, как при обращении к серверу базы по сети.
+"""
+import asyncio
+import time
+
+from benchmarks.fixtures import populate
+from benchmarks.utils import setup_django
+
+REQUESTS = 200
+CONCURRENCY = 20
+QUERY_LATENCY = 0.002
+
+
+async def request(application, path):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path,
+        'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 12345),
+        'headers': [(b'host', b'testserver')],
+    }
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        sent.append(message)
+
+    await application(scope, receive, send)
+    return sent[0]['status']
+
+
+async def load(application, paths):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def worker(path):
+        async with semaphore:
+            return await request(application, path)
+
+    return await asyncio.gather(*(worker(path) for path in paths))
+
+
+def with_latency(execute):
+    def wrapper(self, *args, **kwargs):
+        time.sleep(QUERY_LATENCY)
+        return execute(self, *args, **kwargs)
+    return wrapper
+
+
+def main():
+    setup_django()
+    from django.core.handlers.asgi import ASGIHandler
+    from django.db.backends import utils
+
+    from api.versions import reset_versions
+    from api_yamdb.asgi import AsyncViewASGIHandler
+
+    titles = populate()
+    paths = [
+        f'/api/v1/titles/{titles[i % len(titles)].pk}/reviews/'
+        for i in range(REQUESTS)
+    ]
+    utils.CursorWrapper._execute = with_latency(utils.CursorWrapper._execute)
+    print(f'{REQUESTS} GET-запросов, {CONCURRENCY} одновременно, '
+          f'{QUERY_LATENCY * 1e3:.0f} ms на SQL-запрос:')
+    for label, handler in (('ASGIHandler', ASGIHandler),
+                           ('AsyncViewASGIHandler', AsyncViewASGIHandler)):
+        # Каждый обработчик начинает с пустыми кешами фрагментов и счётчиков.
+        reset_versions()
+        start = time.perf_counter()
+        statuses = asyncio.run(load(handler(), paths))
+        elapsed = time.perf_counter() - start
+        assert set(statuses) == {200}, statuses
+        print(f'  {label:<46} {REQUESTS / elapsed:10.1f} rps')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Сравнение полного и облегчённого стека middleware на запросах к API.
+
+Цепочки собираются вокруг пустого представления, поэтому замер
+показывает только накладные расходы самих middleware.
+"""
+from benchmarks.utils import measure, setup_django
+
+FULL_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+
+def build_chain(middleware):
+    from django.http import HttpResponse
+    from django.utils.module_loading import import_string
+
+    def view(request):
+        return HttpResponse('{}', content_type='application/json')
+
+    handler = view
+    for path in reversed(middleware):
+        instance = import_string(path)(handler)
+        process_view = getattr(instance, 'process_view', None)
+        if process_view is not None:
+            handler = _with_process_view(instance, process_view, view)
+        else:
+            handler = instance
+    return handler
+
+
+def _with_process_view(instance, process_view, view):
+    def handler(request):
+        process_view(request, view, (), {})
+        return instance(request)
+    return handler
+
+
+def main():
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import Client, RequestFactory
+
+    user = get_user_model().objects.create_superuser(
+        'bench', 'bench@yamdb.fake', 'password'
+    )
+    client = Client()
+    client.force_login(user)
+    session_cookie = client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    factory = RequestFactory()
+    for label, cookies in (('anonymous', {}),
+                           ('browser session cookie',
+                            {settings.SESSION_COOKIE_NAME: session_cookie})):
+        print(f'GET /api/v1/genres/, {label}:')
+        factory.cookies.clear()
+        for name, value in cookies.items():
+            factory.cookies[name] = value
+        timings = {}
+        for name, middleware in (('full', FULL_MIDDLEWARE),
+                                 ('lean', settings.MIDDLEWARE)):
+            chain = build_chain(middleware)
+            timings[name] = measure(
+                f'  {name} middleware stack',
+                lambda: chain(factory.get('/api/v1/genres/')),
+                number=2000,
+            )
+        print(f'  saved per request: '
+              f'{(timings["full"] - timings["lean"]) * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Пропускная способность JSON-рендереров на странице произведений."""
+from benchmarks.utils import measure, setup_django
+
+
+def make_page(size):
+    return {
+        'count': size,
+        'next': 'http://testserver/api/v1/titles/?page=2',
+        'previous': None,
+        'results': [
+            {
+                'id': i,
+                'name': f'Произведение {i}',
+                'year': 1900 + i % 120,
+                'rating': 7.25,
+                'description': 'Описание произведения ' * 5,
+                'genre': [
+                    {'name': 'Драма', 'slug': 'drama'},
+                    {'name': 'Комедия', 'slug': 'comedy'},
+                ],
+                'category': {'name': 'Фильм', 'slug': 'movie'},
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def main():
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from api.renderers import FastJSONRenderer, orjson
+
+    if orjson is None:
+        print('orjson is not installed, FastJSONRenderer falls back '
+              'to JSONRenderer')
+    for size in (10, 100, 1000):
+        data = make_page(size)
+        print(f'page of {size} titles:')
+        timings = {}
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            name = type(renderer).__name__
+            timings[name] = measure(
+                f'  {name}', lambda: renderer.render(data),
+                number=max(10, 10000 // size),
+            )
+        speedup = timings['JSONRenderer'] / timings['FastJSONRenderer']
+        print(f'  speedup: x{speedup:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Время сериализации строки: ModelSerializer против сериализаторов строк."""
+from benchmarks.fixtures import populate
+from benchmarks.utils import measure, setup_django
+
+
+def main():
+    setup_django()
+    from django.db.models import Avg
+
+    from api.row_serializers import (ReviewCommentRowSerializer,
+                                     ReviewRowSerializer, TitleRowSerializer)
+    from api.serializers import (ReviewCommentSerializer, ReviewSerializer,
+                                 TitleGetSerializer)
+    from reviews.models import Review, ReviewComment, Title
+
+    populate()
+    titles = (
+        Title.objects.annotate(rating=Avg('reviews__score')).order_by('id')
+    )
+    cases = (
+        ('titles', TitleGetSerializer,
+         titles.select_related('category').prefetch_related('genre'),
+         TitleRowSerializer, titles),
+        ('reviews', ReviewSerializer,
+         Review.objects.select_related('author'),
+         ReviewRowSerializer, Review.objects.all()),
+        ('comments', ReviewCommentSerializer,
+         ReviewComment.objects.select_related('author'),
+         ReviewCommentRowSerializer, ReviewComment.objects.all()),
+    )
+    for name, serializer_class, queryset, row_class, row_queryset in cases:
+        page = 100
+        print(f'{name}, page of {page}, per row:')
+        model_time = measure(
+            '  ModelSerializer',
+            lambda: serializer_class(queryset[:page], many=True).data,
+            number=20,
+        ) / page
+        row_serializer = row_class()
+        row_time = measure(
+            '  RowSerializer',
+            lambda: row_serializer.serialize(
+                row_serializer.values(row_queryset)[:page]
+            ),
+            number=20,
+        ) / page
+        print(f'  {model_time * 1e6:.1f} us -> {row_time * 1e6:.1f} us '
+              f'per row (x{model_time / row_time:.1f})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Наполнение тестовой базы для бенчмарков."""
+import random
+
+
+def populate(titles=200, users=50, reviews_per_title=10,
+             comments_per_review=2, seed=0):
+    """Создаёт каталог с отзывами и комментариями, возвращает произведения."""
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import (Category, Genre, GenreTitle, Review,
+                                ReviewComment, Title)
+
+    # SQLite не возвращает первичные ключи из bulk_create(), поэтому
+    # созданные объекты перечитываются из базы.
+    rnd = random.Random(seed)
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(users)
+    )
+    authors = list(User.objects.all())
+    Category.objects.bulk_create(
+        Category(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(5)
+    )
+    categories = list(Category.objects.all())
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(15)
+    )
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {i}',
+            year=1900 + rnd.randrange(120),
+            description='Описание произведения ' * 3,
+            category=rnd.choice(categories),
+        )
+        for i in range(titles)
+    )
+    created = list(Title.objects.order_by('id'))
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genre)
+        for title in created
+        for genre in rnd.sample(genres, 3)
+    )
+    Review.objects.bulk_create(
+        Review(
+            title=title, author=author, text='Текст отзыва ' * 10,
+            score=rnd.randint(1, 10),
+        )
+        for title in created
+        for author in rnd.sample(authors, min(reviews_per_title, users))
+    )
+    ReviewComment.objects.bulk_create(
+        ReviewComment(
+            review=review, author=rnd.choice(authors),
+            text='Текст комментария ' * 5,
+        )
+        for review in Review.objects.all()
+        for _ in range(comments_per_review)
+    )
+    return created
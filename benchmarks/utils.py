@@ -0,0 +1,34 @@
+"""Общие помощники для бенчмарков.
+
+Бенчмарки запускаются из корня репозитория, например::
+
+    python -m benchmarks.bench_middleware
+"""
+import os
+import sys
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(BASE_DIR, 'api_yamdb')
+
+
+def setup_django():
+    """Настраивает Django и создаёт тестовую базу в памяти."""
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, keepdb=False)
+
+
+def measure(label, func, number=200, repeat=5):
+    """Печатает лучшее время одного вызова ``func`` в микросекундах."""
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f'{label:<48} {best * 1e6:10.1f} us')
+    return best
@@ -1,5 +1,7 @@
 import os
+import shutil
 import sys
+import tempfile
 
 from django.utils.version import get_version
 
@@ -32,4 +34,23 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_jobs',
 ]
+
+
+def pytest_configure(config):
+    """Кеш и вектор версий тестов не затрагивают файлы проекта."""
+    from django.conf import settings
+
+    config.cache_dir = tempfile.mkdtemp(prefix='api_yamdb_tests_')
+    settings.CACHES = {
+        alias: dict(options, LOCATION=os.path.join(
+            config.cache_dir, f'{alias}.sqlite3'
+        ))
+        for alias, options in settings.CACHES.items()
+    }
+    settings.VERSION_BUS_PATH = os.path.join(config.cache_dir, 'versions.bus')
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(config.cache_dir, ignore_errors=True)
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture
+def eager_jobs(settings):
+    """Отложенные задачи выполняются сразу, без обработчика очереди."""
+    settings.JOBS_EAGER = True
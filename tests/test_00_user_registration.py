@@ -102,7 +102,8 @@ class Test00UserRegistration:
             'содержанию - новый пользователь не должен быть создан.'
         )
 
-    def test_00_valid_data_user_signup(self, client, django_user_model):
+    def test_00_valid_data_user_signup(self, client, django_user_model,
+                                       eager_jobs):
         outbox_before_count = len(mail.outbox)
         valid_data = {
             'email': 'valid@yamdb.fake',
@@ -0,0 +1,42 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08APIMiddleware:
+
+    def test_01_api_skips_session_middleware(self, client, admin_client):
+        response = client.get('/api/v1/genres/')
+        assert response.status_code == HTTPStatus.OK
+        request = response.wsgi_request
+        assert not hasattr(request, 'session'), (
+            'Проверьте, что запросы к `/api/` не проходят через '
+            'SessionMiddleware.'
+        )
+        assert not hasattr(request, '_messages'), (
+            'Проверьте, что запросы к `/api/` не проходят через '
+            'MessageMiddleware.'
+        )
+        assert 'Cookie' not in response.get('Vary', ''), (
+            'Проверьте, что ответы API не зависят от cookie.'
+        )
+
+        response = admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запросы к API не требуют CSRF-токена.'
+        )
+
+    def test_02_admin_keeps_session_middleware(self, client):
+        response = client.get('/admin/login/')
+        assert response.status_code == HTTPStatus.OK
+        request = response.wsgi_request
+        assert hasattr(request, 'session'), (
+            'Проверьте, что админка по-прежнему использует сессии.'
+        )
+        assert hasattr(request, 'user')
+        assert 'csrftoken' in response.cookies, (
+            'Проверьте, что админка по-прежнему защищена от CSRF.'
+        )
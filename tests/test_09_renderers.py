@@ -0,0 +1,67 @@
+import datetime
+import decimal
+import io
+import json
+import uuid
+from http import HTTPStatus
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+RENDER_DATA = (
+    None,
+    {},
+    [],
+    {'count': 2, 'next': None, 'results': [{'id': 1, 'rating': 7.5}]},
+    {'name': 'Крепкий орешек', 'lazy': gettext_lazy('Пользователь')},
+    {'pub_date': datetime.datetime(
+        2023, 8, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+    )},
+    {'date': datetime.date(2023, 8, 1), 'time': datetime.time(12, 30)},
+    {'price': decimal.Decimal('1.50'), 'uuid': uuid.UUID(int=1)},
+    {1: 'int key', 'tuple': (1, 2), 'huge': 2 ** 70},
+    {'separator': 'line\u2028paragraph\u2029'},
+)
+
+
+class Test09FastJSON:
+
+    @pytest.mark.parametrize('data', RENDER_DATA)
+    def test_01_renderer_matches_json_renderer(self, data):
+        expected = JSONRenderer().render(data)
+        rendered = FastJSONRenderer().render(data)
+        assert rendered == expected or json.loads(rendered) == json.loads(
+            expected
+        ), 'Проверьте, что FastJSONRenderer рендерит те же данные.'
+        assert b'\xe2\x80\xa8' not in rendered
+
+    def test_02_renderer_indent(self):
+        data = {'results': [1, 2]}
+        assert FastJSONRenderer().render(
+            data, 'application/json; indent=4'
+        ) == JSONRenderer().render(data, 'application/json; indent=4')
+
+    def test_03_parser(self):
+        parser = FastJSONParser()
+        body = '{"name": "Драма", "slug": "drama", "ids": [1, 2.5]}'
+        assert parser.parse(io.BytesIO(body.encode())) == json.loads(body)
+        with pytest.raises(ParseError):
+            parser.parse(io.BytesIO(b'{"name": '))
+        with pytest.raises(ParseError):
+            parser.parse(io.BytesIO(b'{"rating": NaN}'))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_json_request(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что API принимает JSON в теле запроса.'
+        )
+        assert response.json() == {'name': 'Драма', 'slug': 'drama'}
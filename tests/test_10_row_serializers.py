@@ -0,0 +1,55 @@
+import pytest
+from django.db.models import Avg
+
+from api.serializers import (ReviewCommentSerializer, ReviewSerializer,
+                             TitleGetSerializer)
+from reviews.models import Review, ReviewComment, Title
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10RowSerializers:
+
+    def test_01_lists_match_model_serializers(self, client, admin_client,
+                                              admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        Title.objects.create(name='Без категории', year=2000)
+
+        response = client.get('/api/v1/titles/')
+        expected = TitleGetSerializer(
+            Title.objects.annotate(rating=Avg('reviews__score')).order_by('id'),
+            many=True
+        ).data
+        assert response.json()['results'] == expected, (
+            'Проверьте, что список произведений совпадает с выводом '
+            '`TitleGetSerializer`.'
+        )
+        assert [list(item) for item in response.json()['results']] == [
+            list(item) for item in expected
+        ], (
+            'Проверьте, что порядок ключей в списке произведений такой же, '
+            'как у `TitleGetSerializer`.'
+        )
+
+        title_id = titles[0]['id']
+        response = client.get(f'/api/v1/titles/{title_id}/reviews/')
+        expected = ReviewSerializer(
+            Review.objects.filter(title_id=title_id), many=True
+        ).data
+        assert response.json()['results'] == expected, (
+            'Проверьте, что список отзывов совпадает с выводом '
+            '`ReviewSerializer`.'
+        )
+
+        review_id = reviews[0]['id']
+        response = client.get(
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        )
+        expected = ReviewCommentSerializer(
+            ReviewComment.objects.filter(review_id=review_id), many=True
+        ).data
+        assert response.json()['results'] == expected, (
+            'Проверьте, что список комментариев совпадает с выводом '
+            '`ReviewCommentSerializer`.'
+        )
@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11SparseFields:
+
+    def test_01_titles_fields(self, client, admin_client, admin):
+        _, _, titles = create_comments(admin_client, {admin: admin_client})
+        url = '/api/v1/titles/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}?fields=id,name,rating')
+        results = response.json()['results']
+        assert [set(title) for title in results] == [
+            {'id', 'name', 'rating'}
+        ] * len(titles), (
+            f'Проверьте, что параметр `fields` на `{url}` оставляет в '
+            'ответе только перечисленные поля.'
+        )
+        assert all('genre' not in query['sql'] for query in context), (
+            f'Проверьте, что запрос к `{url}` без поля `genre` не '
+            'загружает жанры.'
+        )
+        rating = {title['id']: title['rating'] for title in results}
+        assert rating[titles[0]['id']] == 5.0
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}?fields=name,year,unknown')
+        assert set(response.json()['results'][0]) == {'name', 'year'}
+        assert all('AVG' not in query['sql'] for query in context), (
+            f'Проверьте, что запрос к `{url}` без поля `rating` не '
+            'вычисляет рейтинг.'
+        )
+
+        response = client.get(f'{url}{titles[0]["id"]}/?fields=genre,rating')
+        assert response.json() == {
+            'rating': 5.0,
+            'genre': [
+                {'name': 'Комедия', 'slug': 'comedy'},
+                {'name': 'Ужасы', 'slug': 'horror'},
+            ],
+        }
+
+        response = client.get(f'{url}?fields=')
+        assert set(response.json()['results'][0]) == {
+            'id', 'name', 'year', 'rating', 'description', 'genre',
+            'category', 'reviews_count'
+        }
+
+    def test_02_reviews_and_comments_fields(self, client, admin_client,
+                                            admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(f'{url}?fields=id,author')
+        assert response.json()['results'] == [
+            {'id': review['id'], 'author': review['author']}
+            for review in reviews
+        ]
+        response = client.get(f'{url}{reviews[0]["id"]}/?fields=score')
+        assert response.json() == {'score': 5}
+
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        response = client.get(f'{url}?fields=text')
+        assert response.json()['results'] == [
+            {'text': comment['text']} for comment in comments
+        ]
+        response = client.get(f'{url}{comments[0]["id"]}/?fields=id,author')
+        assert response.json() == {
+            'id': comments[0]['id'], 'author': comments[0]['author']
+        }
+
+        response = admin_client.patch(
+            f'{url}{comments[0]["id"]}/?fields=id', data={'text': 'new'}
+        )
+        assert response.json()['text'] == 'new', (
+            'Проверьте, что параметр `fields` не влияет на изменяющие '
+            'запросы.'
+        )
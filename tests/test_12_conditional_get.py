@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    def test_01_reviews_etag(self, client, admin_client, admin, user_client,
+                             user, moderator_client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert len(context) == 0, (
+            'Проверьте, что ответ 304 отдаётся без запросов к базе данных.'
+        )
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        response = client.get(f'{url}?fields=id', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `ETag` зависит от параметров запроса.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'new', 7)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что `ETag` для `{url}` меняется после '
+            'добавления отзыва.'
+        )
+        etag = response['ETag']
+
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'edit'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что `ETag` для `{url}` меняется после '
+            'изменения отзыва.'
+        )
+
+    def test_02_titles_and_comments_etag(self, client, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_url = f'/api/v1/titles/{titles[1]["id"]}/'
+        comments_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        title_etag = client.get(title_url)['ETag']
+        comments_etag = client.get(comments_url)['ETag']
+        assert client.get(
+            title_url, HTTP_IF_NONE_MATCH=title_etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        admin_client.post(comments_url, data={'text': 'comment'})
+        assert client.get(
+            comments_url, HTTP_IF_NONE_MATCH=comments_etag
+        ).status_code == HTTPStatus.OK
+
+        admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'review', 'score': 3}
+        )
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `ETag` произведения меняется вместе с рейтингом.'
+        )
+        assert response.json()['rating'] == 3
+
+    def test_03_version_after_commit(self, client, admin_client, admin,
+                                     user):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        with transaction.atomic():
+            Review.objects.create(
+                author=user, title_id=titles[0]['id'], text='отзыв', score=4
+            )
+            assert client.get(url)['ETag'] == etag, (
+                'Проверьте, что версии повышаются только после фиксации '
+                'транзакции.'
+            )
+        assert client.get(url)['ETag'] != etag
+
+    def test_04_usernames(self, client, admin_client, admin, user):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        client.post('/api/v1/auth/signup/', data={
+            'username': 'new-user', 'email': 'new-user@yamdb.fake'
+        })
+        admin.bio = 'биография'
+        admin.save()
+        assert client.get(url)['ETag'] == etag, (
+            'Проверьте, что регистрация и изменение полей пользователя, '
+            'кроме логина, не меняют `ETag` отзывов.'
+        )
+        admin.username = 'renamed'
+        admin.save()
+        response = client.get(url)
+        assert response['ETag'] != etag, (
+            'Проверьте, что `ETag` отзывов меняется вместе с логином автора.'
+        )
+        assert response.json()['results'][0]['author'] == 'renamed'
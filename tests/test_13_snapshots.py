@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13CatalogSnapshots:
+
+    def test_01_list_without_queries(self, client, admin_client):
+        genres = create_genre(admin_client)
+        client.get('/api/v1/genres/')
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/genres/')
+        assert response.status_code == HTTPStatus.OK
+        assert len(context) == 0, (
+            'Проверьте, что список жанров отдаётся из снимка без запросов '
+            'к базе данных.'
+        )
+        assert response.json()['results'] == sorted(
+            genres, key=lambda genre: genre['slug']
+        )
+        response = client.get('/api/v1/genres/?search=ДРАМ')
+        assert response.json()['results'] == [
+            {'name': 'Драма', 'slug': 'drama'}
+        ]
+
+        admin_client.delete('/api/v1/genres/drama/')
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Боевик', 'slug': 'action'}
+        )
+        response = client.get('/api/v1/genres/')
+        assert [genre['slug'] for genre in response.json()['results']] == [
+            'action', 'comedy', 'horror'
+        ], 'Проверьте, что снимок обновляется после изменения жанров.'
+
+    def test_02_title_slugs_from_snapshot(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = {
+            'name': 'Терминатор',
+            'year': 1984,
+            'genre': [genres[0]['slug'], genres[1]['slug']],
+            'category': categories[0]['slug'],
+        }
+        admin_client.post('/api/v1/titles/', data=data)
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        lookups = [
+            query['sql'] for query in context
+            if '"slug" IN' in query['sql'] or '"slug" =' in query['sql']
+        ]
+        assert not lookups, (
+            'Проверьте, что slug жанров и категорий при создании '
+            'произведения берутся из снимка.'
+        )
+        assert response.json()['category'] == categories[0]
+
+        data['genre'] = ['unknown']
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'genre' in response.json()
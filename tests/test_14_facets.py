@@ -0,0 +1,151 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def create_catalog(admin_client):
+    titles, categories, genres = create_titles(admin_client)
+    data = {
+        'name': 'Комедия ужасов',
+        'year': 2001,
+        'genre': ['horror', 'comedy', 'drama'],
+        'category': 'books',
+    }
+    response = admin_client.post('/api/v1/titles/', data=data)
+    data['id'] = response.json()['id']
+    titles.append(data)
+    return titles
+
+
+def names(response):
+    return sorted(title['name'] for title in response.json()['results'])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14FacetFilters:
+
+    url = '/api/v1/titles/'
+
+    def test_01_multi_value_filters(self, client, admin_client):
+        create_catalog(admin_client)
+        cases = (
+            ('genre=drama', ['Комедия ужасов', 'Крепкий орешек']),
+            ('genre=horror,drama',
+             ['Комедия ужасов', 'Крепкий орешек', 'Терминатор']),
+            ('genre_all=horror,comedy', ['Комедия ужасов', 'Терминатор']),
+            ('genre_all=horror,drama', ['Комедия ужасов']),
+            ('category=books', ['Комедия ужасов', 'Крепкий орешек']),
+            ('category=films,books',
+             ['Комедия ужасов', 'Крепкий орешек', 'Терминатор']),
+            ('year=1984', ['Терминатор']),
+            ('year_min=1985', ['Комедия ужасов', 'Крепкий орешек']),
+            ('year_min=1980&year_max=1990', ['Крепкий орешек', 'Терминатор']),
+            ('genre=horror&category=books&year_min=2000', ['Комедия ужасов']),
+            ('genre=drama&name=орешек', ['Крепкий орешек']),
+            ('genre=unknown', []),
+        )
+        for query, expected in cases:
+            response = client.get(f'{self.url}?{query}')
+            assert response.status_code == HTTPStatus.OK
+            assert names(response) == expected, (
+                f'Проверьте фильтрацию `{self.url}?{query}`.'
+            )
+            assert response.json()['count'] == len(expected)
+
+        response = client.get(f'{self.url}?year_min=abc')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_pages_from_index(self, client, admin_client):
+        create_catalog(admin_client)
+        client.get(f'{self.url}?genre=horror')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{self.url}?genre=horror&year_min=1900')
+        assert response.json()['count'] == 2
+        assert all('WHERE "reviews_genre"."slug"' not in query['sql']
+                   for query in context), (
+            'Проверьте, что фильтрация по жанрам выполняется по индексу, '
+            'а не соединением с `GenreTitle`.'
+        )
+
+    def test_03_index_follows_writes(self, client, admin_client):
+        titles = create_catalog(admin_client)
+        assert names(client.get(f'{self.url}?genre=drama')) == [
+            'Комедия ужасов', 'Крепкий орешек'
+        ]
+
+        admin_client.patch(
+            f'{self.url}{titles[0]["id"]}/',
+            data={'genre': ['drama'], 'year': 1995, 'category': 'books'}
+        )
+        assert names(client.get(f'{self.url}?genre=drama')) == [
+            'Комедия ужасов', 'Крепкий орешек', 'Терминатор'
+        ]
+        assert names(client.get(f'{self.url}?genre=horror')) == [
+            'Комедия ужасов'
+        ]
+        assert names(client.get(f'{self.url}?year=1995&category=books')) == [
+            'Терминатор'
+        ]
+
+        admin_client.delete(f'{self.url}{titles[2]["id"]}/')
+        assert names(client.get(f'{self.url}?genre=drama')) == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+        admin_client.delete('/api/v1/genres/drama/')
+        assert names(client.get(f'{self.url}?genre=drama')) == []
+        admin_client.delete('/api/v1/categories/books/')
+        assert names(client.get(f'{self.url}?category=books')) == []
+        assert names(client.get(f'{self.url}?year_min=0')) == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+
+    def test_04_facet_counts(self, client, admin_client):
+        create_catalog(admin_client)
+        url = f'{self.url}facets/'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{url}` доступен без авторизации.'
+        )
+        assert response.json() == {
+            'count': 3,
+            'genre': [
+                {'name': 'Комедия', 'slug': 'comedy', 'count': 2},
+                {'name': 'Драма', 'slug': 'drama', 'count': 2},
+                {'name': 'Ужасы', 'slug': 'horror', 'count': 2},
+            ],
+            'category': [
+                {'name': 'Книги', 'slug': 'books', 'count': 2},
+                {'name': 'Фильм', 'slug': 'films', 'count': 1},
+            ],
+            'year': [
+                {'year': 1984, 'count': 1},
+                {'year': 1988, 'count': 1},
+                {'year': 2001, 'count': 1},
+            ],
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}?genre=drama&category=books')
+        assert len(context) == 0, (
+            f'Проверьте, что `{url}` считается по индексу без запросов '
+            'к базе данных.'
+        )
+        data = response.json()
+        assert data['count'] == 2
+        assert [genre['count'] for genre in data['genre']] == [1, 2, 1], (
+            'Проверьте, что счётчики жанров не учитывают выбранные жанры.'
+        )
+        assert [category['count'] for category in data['category']] == [
+            2, 0
+        ]
+        assert data['year'] == [
+            {'year': 1988, 'count': 1}, {'year': 2001, 'count': 1}
+        ]
+
+        data = client.get(f'{url}?name=Термин').json()
+        assert data['count'] == 1
+        assert [genre['count'] for genre in data['genre']] == [1, 0, 1]
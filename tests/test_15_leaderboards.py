@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title, TitleRating
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Leaderboards:
+
+    url = '/api/v1/titles/top/'
+
+    def test_01_bayesian_ranking(self, client, admin_client, admin,
+                                 user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+        flop = Title.objects.create(name='Провал', year=2000).pk
+        create_single_review(admin_client, terminator, 'text', 10)
+        for user_client_ in (admin_client, user_client, moderator_client):
+            create_single_review(user_client_, die_hard, 'text', 9)
+            create_single_review(user_client_, flop, 'text', 1)
+
+        rating = TitleRating.objects.get(title_id=die_hard)
+        assert (rating.votes, rating.score_sum) == (3, 27)
+        call_command('refresh_leaderboard')
+
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{self.url}` доступен без авторизации.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data] == [
+            die_hard, terminator, flop
+        ], (
+            'Проверьте, что произведение с одной высокой оценкой не '
+            'обгоняет произведение с несколькими хорошими оценками.'
+        )
+        # Среднее по всем отзывам 40 / 7, порог — 5 оценок.
+        assert data[0]['weighted_rating'] == pytest.approx(
+            (27 + 5 * 40 / 7) / 8
+        )
+        assert data[0]['rating'] == 9.0
+        assert data[0]['category'] == {'name': 'Книги', 'slug': 'books'}
+
+        assert [t['id'] for t in client.get(
+            f'{self.url}?category=films').json()] == [terminator]
+        assert [t['id'] for t in client.get(
+            f'{self.url}?genre=drama').json()] == [die_hard]
+        assert client.get(f'{self.url}?genre=unknown').json() == []
+        assert [t['id'] for t in client.get(
+            f'{self.url}?limit=1').json()] == [die_hard]
+
+    def test_02_ratings_follow_reviews(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        review = create_single_review(admin_client, title_id, 'text', 4)
+        create_single_review(user_client, title_id, 'text', 6)
+        assert TitleRating.objects.get(title_id=title_id).score_sum == 10
+
+        admin_client.patch(f'{url}{review.json()["id"]}/', data={'score': 9})
+        assert TitleRating.objects.get(title_id=title_id).score_sum == 15
+
+        admin_client.patch(
+            f'/api/v1/titles/{title_id}/', data={'category': 'books'}
+        )
+        assert TitleRating.objects.get(
+            title_id=title_id
+        ).category.slug == 'books'
+
+        incremental = list(TitleRating.objects.values_list(
+            'title_id', 'category_id', 'votes', 'score_sum'
+        ))
+        call_command('refresh_leaderboard')
+        assert list(TitleRating.objects.values_list(
+            'title_id', 'category_id', 'votes', 'score_sum'
+        )) == incremental
+        assert TitleRating.objects.get().weighted_rating == (
+            pytest.approx((15 + 5 * 7.5) / 7)
+        )
+
+        admin_client.delete(f'{url}{review.json()["id"]}/')
+        assert TitleRating.objects.get(title_id=title_id).votes == 1
+        admin_client.delete(f'/api/v1/titles/{title_id}/')
+        assert not TitleRating.objects.exists()
+
+    def test_03_sparse_fields(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'text', 8)
+        response = client.get(f'{self.url}?fields=name')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что `{self.url}` поддерживает параметр `fields`.'
+        )
+        assert response.json() == [{
+            'name': titles[0]['name'],
+            'weighted_rating': TitleRating.objects.get(
+                title_id=title_id
+            ).weighted_rating,
+        }]
+        data = client.get(f'{self.url}?fields=id,rating').json()
+        assert [(title['id'], title['rating']) for title in data] == [
+            (title_id, 8.0)
+        ]
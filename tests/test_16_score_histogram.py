@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import TitleRating
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ScoreHistogram:
+
+    def test_01_histogram_follows_reviews(self, client, admin_client,
+                                          user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/'
+        empty = {str(score): 0 for score in range(1, 11)}
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['scores'] == empty, (
+            'Проверьте, что у произведения без отзывов все счётчики '
+            'распределения оценок равны нулю.'
+        )
+
+        review = create_single_review(admin_client, title_id, 'text', 7)
+        create_single_review(user_client, title_id, 'text', 7)
+        create_single_review(moderator_client, title_id, 'text', 3)
+        assert client.get(url).json()['scores'] == dict(
+            empty, **{'7': 2, '3': 1}
+        ), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'распределение оценок в ключе `scores`.'
+        )
+
+        review_url = f'{url}reviews/{review.json()["id"]}/'
+        admin_client.patch(review_url, data={'score': 10})
+        assert client.get(url).json()['scores'] == dict(
+            empty, **{'7': 1, '3': 1, '10': 1}
+        ), 'Проверьте, что изменение оценки обновляет распределение.'
+
+        admin_client.delete(review_url)
+        assert client.get(url).json()['scores'] == dict(
+            empty, **{'7': 1, '3': 1}
+        ), 'Проверьте, что удаление отзыва обновляет распределение.'
+
+        assert 'scores' not in client.get('/api/v1/titles/').json()[
+            'results'][0]
+
+    def test_02_histogram_without_reviews_table(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'text', 5)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                f'/api/v1/titles/{title_id}/?fields=name,scores'
+            )
+        assert response.json() == {
+            'name': titles[0]['name'],
+            'scores': dict(
+                {str(score): 0 for score in range(1, 11)}, **{'5': 1}
+            ),
+        }
+        assert len(context.captured_queries) == 1
+        assert 'reviews_review' not in context.captured_queries[0]['sql'], (
+            'Проверьте, что распределение оценок читается без запроса к '
+            'таблице отзывов.'
+        )
+
+    def test_03_atomic_score_update(self, client, admin_client,
+                                    monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/'
+        review = create_single_review(admin_client, title_id, 'text', 7)
+        review_url = f'{url}reviews/{review.json()["id"]}/'
+
+        def fail(*args, **kwargs):
+            raise RuntimeError
+
+        monkeypatch.setattr(TitleRating.objects, 'change_scores', fail)
+        with pytest.raises(RuntimeError):
+            admin_client.patch(review_url, data={'score': 2})
+        monkeypatch.undo()
+        assert client.get(review_url).json()['score'] == 7, (
+            'Проверьте, что изменение оценки и распределения оценок '
+            'выполняются в одной транзакции.'
+        )
+        assert client.get(url).json()['scores']['7'] == 1
@@ -0,0 +1,73 @@
+import pytest
+
+from reviews.models import Review, Title
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Counters:
+
+    def test_01_counters_follow_writes(self, client, admin_client, admin,
+                                       user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/'
+
+        title = client.get(url).json()
+        assert title['reviews_count'] == 2, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит число '
+            'отзывов в ключе `reviews_count`.'
+        )
+        listed = client.get('/api/v1/titles/').json()['results']
+        assert {t['id']: t['reviews_count'] for t in listed}[title_id] == 2
+
+        review_id = reviews[0]['id']
+        reviews_url = f'{url}reviews/'
+        review = client.get(f'{reviews_url}{review_id}/').json()
+        assert review['comments_count'] == Review.objects.get(
+            pk=review_id
+        ).comments.count(), (
+            'Проверьте, что ответ на GET-запрос к отзыву содержит число '
+            'комментариев в ключе `comments_count`.'
+        )
+        assert {
+            r['id']: r['comments_count']
+            for r in client.get(reviews_url).json()['results']
+        }[review_id] == review['comments_count']
+
+        comments_url = f'{reviews_url}{review_id}/comments/'
+        created = admin_client.post(comments_url, data={'text': 'ещё'})
+        assert client.get(reviews_url).json()['results'][0][
+            'comments_count'
+        ] == review['comments_count'] + 1, (
+            'Проверьте, что список отзывов обновляется после нового '
+            'комментария.'
+        )
+        admin_client.delete(f'{comments_url}{created.json()["id"]}/')
+        assert Review.objects.get(
+            pk=review_id
+        ).comments_count == review['comments_count']
+
+        admin_client.patch(url, data={'name': 'Новое имя'})
+        assert Title.objects.get(pk=title_id).reviews_count == 2, (
+            'Проверьте, что изменение произведения не сбрасывает счётчик.'
+        )
+
+        admin_client.delete(f'{reviews_url}{review_id}/')
+        assert client.get(url).json()['reviews_count'] == 1
+
+    def test_02_cascade_delete(self, admin_client, admin, user_client, user,
+                               eager_jobs):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        user.delete()
+        for title in Title.objects.all():
+            assert title.reviews_count == title.reviews.count(), (
+                'Проверьте, что при удалении автора счётчики отзывов '
+                'уменьшаются.'
+            )
+        for review in Review.objects.all():
+            assert review.comments_count == review.comments.count()
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, ReviewComment, Title
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18CursorPagination:
+
+    def walk(self, client, url):
+        ids, pages = [], []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert set(data) == {'next', 'previous', 'results'}, (
+                'Проверьте, что курсорная пагинация возвращает ключи '
+                '`next`, `previous` и `results` без `count`.'
+            )
+            ids += [item['id'] for item in data['results']]
+            pages.append(data)
+            url = data['next']
+        return ids, pages
+
+    def test_01_reviews_cursor(self, client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        for idx in range(7):
+            author = User.objects.create(
+                username=f'user{idx}', email=f'user{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text='text', score=5
+            )
+        # Одинаковая дата у части отзывов: порядок задаёт id.
+        first = Review.objects.order_by('id').first()
+        Review.objects.filter(id__lte=first.id + 3).update(
+            pub_date=first.pub_date
+        )
+        expected = list(
+            Review.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor&limit=3'
+        ids, pages = self.walk(client, url)
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация отдаёт все отзывы по '
+            'убыванию `(pub_date, id)` без пропусков и повторов.'
+        )
+        assert [len(page['results']) for page in pages] == [3, 3, 1]
+        assert pages[0]['previous'] is None
+
+        previous = client.get(pages[-1]['previous']).json()
+        assert [item['id'] for item in previous['results']] == expected[3:6], (
+            'Проверьте, что ссылка `previous` ведёт на предыдущую страницу.'
+        )
+        assert [
+            item['id'] for item in client.get(previous['previous']).json()[
+                'results']
+        ] == expected[:3]
+
+        with CaptureQueriesContext(connection) as context:
+            client.get(pages[0]['next'])
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'COUNT' not in sql and 'OFFSET' not in sql, (
+            'Проверьте, что курсорная пагинация не считает число записей и '
+            'не использует смещение.'
+        )
+
+        response = client.get(f'{url}&cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.json()['count'] == 7, (
+            'Проверьте, что без параметра `pagination` используется '
+            'прежняя пагинация.'
+        )
+
+    def test_02_comments_cursor_with_fields(self, client):
+        author = User.objects.create(username='user', email='u@yamdb.fake')
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=author, text='text', score=5
+        )
+        for idx in range(5):
+            ReviewComment.objects.create(
+                review=review, author=author, text=f'comment {idx}'
+            )
+        url = (
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            '?pagination=cursor&limit=2&fields=id'
+        )
+        ids, pages = self.walk(client, url)
+        assert ids == sorted(ids, reverse=True)
+        assert len(ids) == 5
+        assert pages[0]['results'][0] == {'id': ids[0]}, (
+            'Проверьте, что курсорная пагинация совместима с `?fields=`.'
+        )
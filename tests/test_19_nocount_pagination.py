@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_titles
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19NoCountPagination:
+
+    def check_no_count(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` не содержит '
+            '`count` в режиме `pagination=nocount`.'
+        )
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), f'Проверьте, что запрос к `{url}` не выполняет COUNT(*).'
+        return data
+
+    def test_01_titles(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data = self.check_no_count(client, '/api/v1/titles/?pagination=nocount')
+        assert [t['id'] for t in data['results']] == sorted(
+            t['id'] for t in titles
+        )
+        assert data['next'] is None and data['previous'] is None
+
+        response = client.get('/api/v1/titles/?pagination=nocount&page=2')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что пустая страница в режиме `pagination=nocount` '
+            'возвращает 404.'
+        )
+
+    def test_02_reviews_and_users(self, client, admin_client, admin,
+                                  user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            '?pagination=nocount&limit=1'
+        )
+        first = self.check_no_count(client, url)
+        assert len(first['results']) == 1
+        assert first['next'] is not None and first['previous'] is None, (
+            'Проверьте, что ссылка `next` вычисляется по лишней строке '
+            'страницы.'
+        )
+        second = self.check_no_count(client, first['next'])
+        assert second['next'] is None
+        assert second['previous'] is not None
+        assert first['results'][0]['id'] != second['results'][0]['id']
+
+        User.objects.create(username='third', email='third@yamdb.fake')
+        data = self.check_no_count(
+            admin_client, '/api/v1/users/?pagination=nocount&limit=2'
+        )
+        assert len(data['results']) == 2 and data['next'] is not None
+        assert 'count' in admin_client.get('/api/v1/users/').json(), (
+            'Проверьте, что без параметра `pagination` сохраняется прежняя '
+            'пагинация.'
+        )
@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20CachedCounts:
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(url).json()
+        counted = any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        )
+        return data, counted
+
+    def test_01_titles_count(self, client, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        data, counted = self.get(client, url)
+        assert (data['count'], data['count_cached'], counted) == (
+            2, False, True
+        )
+        data, counted = self.get(client, f'{url}?page=1')
+        assert (data['count'], data['count_cached'], counted) == (
+            2, True, False
+        ), (
+            f'Проверьте, что повторный запрос к `{url}` берёт `count` из '
+            'кеша и отмечает это флагом `count_cached`.'
+        )
+
+        data, _ = self.get(client, f'{url}?name=Терминатор')
+        assert (data['count'], data['count_cached']) == (1, False), (
+            'Проверьте, что у разных фильтров разные записи кеша.'
+        )
+
+        create_single_review(admin_client, data['results'][0]['id'],
+                             'отзыв', 5)
+        data, counted = self.get(client, url)
+        assert (data['count_cached'], counted) == (True, False), (
+            'Проверьте, что отзывы не сбрасывают кешированное число '
+            'произведений.'
+        )
+
+        Title.objects.create(name='Новое', year=2000)
+        data, counted = self.get(client, url)
+        assert (data['count'], data['count_cached'], counted) == (
+            3, False, True
+        ), 'Проверьте, что запись в таблицу сбрасывает кешированное число.'
+
+    def test_02_users_count(self, admin_client):
+        url = '/api/v1/users/'
+        data, _ = self.get(admin_client, url)
+        count = data['count']
+        assert data['count_cached'] is False
+        data, counted = self.get(admin_client, f'{url}?limit=1&offset=0')
+        assert (data['count'], data['count_cached'], counted) == (
+            count, True, False
+        )
+        User.objects.create(username='another', email='another@yamdb.fake')
+        data, _ = self.get(admin_client, url)
+        assert (data['count'], data['count_cached']) == (count + 1, False)
@@ -0,0 +1,80 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Batch:
+
+    url = '/api/v1/batch/'
+
+    def post(self, client, paths):
+        return client.post(
+            self.url,
+            data=json.dumps({'requests': [{'path': path} for path in paths]}),
+            content_type='application/json'
+        )
+
+    def test_01_batch(self, client, admin_client, admin, user_client, user,
+                      monkeypatch):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        paths = [
+            title_url,
+            f'{title_url}reviews/?limit=1',
+            '/api/v1/genres/',
+            '/api/v1/categories/',
+        ]
+        response = self.post(client, paths)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.url}` доступен без '
+            'авторизации.'
+        )
+        data = response.json()
+        assert [item['path'] for item in data] == paths
+        assert all(item['status'] == HTTPStatus.OK for item in data)
+        for path, item in zip(paths, data):
+            assert item['body'] == client.get(path).json(), (
+                f'Проверьте, что ответ подзапроса `{path}` совпадает с '
+                'ответом на обычный GET-запрос.'
+            )
+        assert 'ETag' in data[0]['headers']
+
+        calls = []
+        validate = JWTAuthentication.get_validated_token
+        monkeypatch.setattr(
+            JWTAuthentication, 'get_validated_token',
+            lambda self, token: calls.append(1) or validate(self, token)
+        )
+        data = self.post(admin_client, ['/api/v1/users/', '/api/v1/users/me/'])
+        assert [item['status'] for item in data.json()] == [200, 200]
+        assert data.json()[1]['body']['username'] == admin.username
+        assert len(calls) == 1, (
+            'Проверьте, что токен проверяется один раз на весь пакет '
+            'подзапросов.'
+        )
+
+        data = self.post(client, ['/api/v1/users/']).json()
+        assert data[0]['status'] == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что подзапросы проверяют права доступа.'
+        )
+
+    def test_02_invalid_requests(self, client):
+        data = self.post(client, [
+            '/api/v1/unknown/', '/api/v1/auth/token/', '/admin/',
+            self.url,
+        ]).json()
+        assert [item['status'] for item in data] == [404] * 4, (
+            'Проверьте, что подзапросы выполняются только к эндпоинтам '
+            'роутера API.'
+        )
+        response = self.post(client, ['/api/v1/genres/'] * 21)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = self.post(client, [])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
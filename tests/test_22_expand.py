@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, ReviewComment, Title
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Expand:
+
+    def create_reviews(self):
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(3)
+        ]
+        authors = [
+            User.objects.create(
+                username=f'user{idx}', email=f'user{idx}@yamdb.fake'
+            )
+            for idx in range(5)
+        ]
+        for count, title in zip((5, 2, 0), titles):
+            for author in authors[:count]:
+                Review.objects.create(
+                    title=title, author=author, text='text', score=5
+                )
+        return titles
+
+    def expected(self, title):
+        return [
+            review.id for review in
+            title.reviews.order_by('-pub_date', '-id')[:3]
+        ]
+
+    def test_01_list_expand(self, client):
+        titles = self.create_reviews()
+        url = '/api/v1/titles/?expand=latest_reviews'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        results = response.json()['results']
+        for title, data in zip(titles, results):
+            assert [r['id'] for r in data['latest_reviews']] == (
+                self.expected(title)
+            ), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'три новых отзыва каждого произведения.'
+            )
+        assert set(results[0]['latest_reviews'][0]) == {
+            'id', 'text', 'author', 'score', 'pub_date', 'comments_count'
+        }
+        review_queries = [
+            query for query in context.captured_queries
+            if 'FROM "reviews_review"' in query['sql']
+            and 'ROW_NUMBER' in query['sql']
+        ]
+        assert len(review_queries) == 1, (
+            'Проверьте, что отзывы всей страницы загружаются одним '
+            'оконным запросом.'
+        )
+        assert 'latest_reviews' not in client.get(
+            '/api/v1/titles/').json()['results'][0]
+
+        data = client.get(
+            '/api/v1/titles/?expand=latest_reviews&fields=name'
+        ).json()['results'][0]
+        assert set(data) == {'name', 'latest_reviews'}
+
+    def test_02_detail_expand(self, client):
+        titles = self.create_reviews()
+        data = client.get(
+            f'/api/v1/titles/{titles[0].id}/?expand=latest_reviews,unknown'
+        ).json()
+        assert [r['id'] for r in data['latest_reviews']] == (
+            self.expected(titles[0])
+        )
+        assert 'unknown' not in data
+
+    def test_03_expand_validators(self, client):
+        titles = self.create_reviews()
+        url = '/api/v1/titles/?expand=latest_reviews'
+        response = client.get(url)
+        etag = response['ETag']
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        review = titles[0].reviews.order_by('-pub_date', '-id')[0]
+        ReviewComment.objects.create(
+            review=review, author=review.author, text='text'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag списка '
+            'произведений с вложенными отзывами.'
+        )
+        assert response.json()['results'][0]['latest_reviews'][0][
+            'comments_count'
+        ] == 1
+        etag = response['ETag']
+
+        review.author.username = 'renamed'
+        review.author.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена логина автора меняет ETag списка '
+            'произведений с вложенными отзывами.'
+        )
+        assert response.json()['results'][0]['latest_reviews'][0][
+            'author'
+        ] == 'renamed'
@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category
+from tests.utils import create_comments
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Fragments:
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(url).json()['results']
+        return data, [query['sql'] for query in context.captured_queries]
+
+    def test_01_titles(self, client, admin_client, admin, user_client, user):
+        _, _, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = '/api/v1/titles/'
+        first, _ = self.get(client, url)
+        second, queries = self.get(client, url)
+        assert second == first
+        assert not any('reviews_genretitle' in sql for sql in queries), (
+            f'Проверьте, что повторный запрос к `{url}` берёт представления '
+            'произведений из кеша без сериализации.'
+        )
+        assert not any('AVG(' in sql for sql in queries)
+
+        title_id = titles[0]['id']
+        admin_client.patch(f'{url}{title_id}/', data={'name': 'Другое имя'})
+        data, _ = self.get(client, url)
+        assert {t['id']: t['name'] for t in data}[title_id] == 'Другое имя', (
+            'Проверьте, что изменение произведения обновляет его '
+            'представление в списке.'
+        )
+
+        category = Category.objects.get(slug='films')
+        category.name = 'Кино'
+        category.save()
+        data, _ = self.get(client, url)
+        assert {
+            t['category']['slug']: t['category']['name'] for t in data
+        }['films'] == 'Кино', (
+            'Проверьте, что переименование категории обновляет '
+            'представления произведений.'
+        )
+
+    def test_02_reviews_and_comments(self, client, admin_client, admin,
+                                     user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        first, _ = self.get(client, reviews_url)
+        rating = client.get(f'/api/v1/titles/{title_id}/').json()['rating']
+        self.get(client, '/api/v1/titles/')
+
+        review_id = reviews[0]['id']
+        comments_url = f'{reviews_url}{review_id}/comments/'
+        user_client.post(comments_url, data={'text': 'ещё'})
+        data, _ = self.get(client, reviews_url)
+        counts = {r['id']: r['comments_count'] for r in data}
+        before = {r['id']: r['comments_count'] for r in first}
+        assert counts[review_id] == before[review_id] + 1, (
+            'Проверьте, что новый комментарий обновляет представление '
+            'отзыва в списке.'
+        )
+
+        User.objects.filter(pk=user.pk).update(username='renamed')
+        User.objects.get(pk=user.pk).save()
+        data, _ = self.get(client, comments_url)
+        assert 'renamed' in {comment['author'] for comment in data}, (
+            'Проверьте, что смена имени пользователя обновляет '
+            'представления комментариев.'
+        )
+
+        admin_client.patch(
+            f'{reviews_url}{review_id}/', data={'score': 1}
+        )
+        data, _ = self.get(client, '/api/v1/titles/')
+        assert {t['id']: t['rating'] for t in data}[title_id] != rating, (
+            'Проверьте, что изменение отзыва обновляет рейтинг в '
+            'представлении произведения.'
+        )
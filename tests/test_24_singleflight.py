@@ -0,0 +1,77 @@
+import threading
+import time
+
+from django.core.cache import cache
+
+from api import singleflight
+
+
+class Test24SingleFlight:
+
+    def test_01_stale_while_revalidate(self):
+        key = 'test:stale'
+        calls = []
+
+        def fill():
+            calls.append(1)
+            return len(calls)
+
+        assert singleflight.get_or_fill(key, 1, fill) == (1, False)
+        assert singleflight.get_or_fill(key, 1, fill) == (1, True)
+
+        assert singleflight.acquire(key) == [key]
+        try:
+            assert singleflight.get_or_fill(key, 2, fill, stale=True) == (
+                1, True
+            ), (
+                'Проверьте, что пока значение пересчитывает другой запрос, '
+                'возвращается устаревшее.'
+            )
+        finally:
+            singleflight.release(key)
+        assert len(calls) == 1
+        assert singleflight.get_or_fill(key, 2, fill) == (2, False)
+        cache.delete(key)
+
+    def test_02_waits_for_owner(self, monkeypatch):
+        monkeypatch.setattr(singleflight, 'WAIT_TIMEOUT', 0.05)
+        key = 'test:wait'
+        assert singleflight.acquire(key) == [key]
+        try:
+            # Владелец блокировки так и не записал значение.
+            assert singleflight.get_or_fill(key, 1, lambda: 'own') == (
+                'own', False
+            )
+        finally:
+            singleflight.release(key)
+        cache.delete(key)
+
+    def test_03_many_single_fill(self):
+        keys = {pk: f'test:many:{pk}' for pk in range(5)}
+        calls = []
+        lock = threading.Lock()
+
+        def fill(ids):
+            with lock:
+                calls.extend(ids)
+            time.sleep(0.05)
+            return {pk: pk * 10 for pk in ids if pk != 4}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                singleflight.get_many_or_fill(keys, fill)
+            ))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = {pk: pk * 10 for pk in range(4)}
+        assert results == [expected] * 4
+        assert sorted(pk for pk in calls if pk != 4) == [0, 1, 2, 3], (
+            'Проверьте, что каждое значение вычисляет только один запрос.'
+        )
+        cache.delete_many(keys.values())
@@ -0,0 +1,121 @@
+import multiprocessing
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+
+from api import facets, signals, singleflight, snapshots
+from api.versions import (FACETS, GENRES, bump_versions, bus, get_version,
+                          reviews_scope)
+from tests.utils import create_categories, create_genre
+
+
+def bump_genres(queue):
+    queue.put(bump_versions(GENRES)[0])
+
+
+def bump_facets(queue):
+    queue.put(bump_versions(FACETS)[0])
+
+
+def bump_reviews(queue):
+    queue.put(bump_versions(reviews_scope(1))[0])
+
+
+def acquire_lock(queue):
+    queue.put(singleflight.acquire('fragment'))
+
+
+def in_other_process(target):
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    process = context.Process(target=target, args=(queue,))
+    process.start()
+    process.join()
+    return queue.get()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25VersionBus:
+
+    def test_01_other_process_invalidates(self, client, admin_client):
+        create_genre(admin_client)
+        client.get('/api/v1/genres/')
+        assert snapshots.genres.state is not None
+
+        version = in_other_process(bump_genres)
+
+        assert get_version(GENRES) == version, (
+            'Проверьте, что версия, изменённая другим процессом, видна '
+            'в текущем.'
+        )
+        bus.sync()
+        assert snapshots.genres.state is None, (
+            'Проверьте, что снимок справочника сбрасывается после записи '
+            'в другом процессе.'
+        )
+        assert len(client.get('/api/v1/genres/').json()['results']) == len(
+            snapshots.genres.items()
+        )
+
+    def test_02_local_writes_keep_index(self, client, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        client.get('/api/v1/titles/?genre=horror')
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой', 'year': 1979, 'genre': ['horror'],
+            'category': 'films',
+        })
+        assert response.status_code == 201
+        client.get('/api/v1/titles/')
+        assert facets.index.version == get_version(FACETS), (
+            'Проверьте, что запись в текущем процессе не сбрасывает '
+            'фасетный индекс.'
+        )
+        assert client.get('/api/v1/titles/?genre=horror').json()[
+            'count'
+        ] == 1
+
+    def test_03_concurrent_facet_writes(self, client, admin_client):
+        create_genre(admin_client)
+        client.get('/api/v1/titles/?genre=horror')
+        assert facets.index.version == get_version(FACETS)
+        in_other_process(bump_facets)
+        applied = []
+        facets.index._apply(lambda: applied.append(True))
+        assert not applied and facets.index.version != get_version(FACETS), (
+            'Проверьте, что фасетный индекс не считается актуальным, если '
+            'версию `FACETS` повысил другой процесс.'
+        )
+
+    def test_04_shared_cache(self):
+        get_version(reviews_scope(1))
+        version = in_other_process(bump_reviews)
+        assert get_version(reviews_scope(1)) == version, (
+            'Проверьте, что версии коллекций в кеше общие для процессов.'
+        )
+        assert in_other_process(acquire_lock) == ['fragment']
+        assert singleflight.acquire('fragment') == [], (
+            'Проверьте, что блокировку заполнения, полученную другим '
+            'процессом, нельзя получить повторно.'
+        )
+        singleflight.release('fragment')
+        assert singleflight.acquire('fragment') == ['fragment']
+        singleflight.release('fragment')
+
+    def test_05_isolated_files(self, monkeypatch):
+        project = settings.BASE_DIR
+        assert project not in Path(settings.VERSION_BUS_PATH).parents
+        assert project not in Path(caches['default'].location).parents, (
+            'Проверьте, что тесты не используют кеш и вектор версий '
+            'запущенного сервера.'
+        )
+        resets = []
+        monkeypatch.setattr(signals, 'reset_versions',
+                            lambda: resets.append(1))
+        call_command('migrate', verbosity=0)
+        assert len(resets) == 1, (
+            'Проверьте, что после миграций версии сбрасываются один раз.'
+        )
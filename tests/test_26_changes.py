@@ -0,0 +1,161 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib import admin
+from django.test import RequestFactory
+
+from reviews.models import ChangeLog
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Changes:
+
+    url = '/api/v1/changes/'
+
+    def sync(self, client, since=0, limit=None):
+        url = f'{self.url}?since={since}'
+        if limit:
+            url += f'&limit={limit}'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{self.url}` доступен без авторизации.'
+        )
+        return response.json()
+
+    def test_01_delta_sync(self, client, admin_client, admin, user_client,
+                           user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        data = self.sync(client)
+        assert not data['has_more']
+        cursors = [change['cursor'] for change in data['results']]
+        assert cursors == sorted(cursors)
+        changed = {
+            (change['model'], change['id']): change
+            for change in data['results']
+        }
+        for title in titles:
+            assert ('title', title['id']) in changed
+        review = changed[('review', reviews[0]['id'])]
+        assert review['data']['title_id'] == titles[0]['id']
+        assert review['data']['text'] == reviews[0]['text']
+        comment = changed[('comment', comments[0]['id'])]
+        assert comment['data']['review_id'] == reviews[0]['id'], (
+            'Проверьте, что изменения содержат данные объектов и id '
+            'родителей.'
+        )
+        assert len(data['results']) == len(changed), (
+            'Проверьте, что на странице остаётся последнее изменение '
+            'каждого объекта.'
+        )
+
+        since = data['next']
+        assert self.sync(client, since)['results'] == []
+
+        title_id = titles[0]['id']
+        review_url = f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+        admin_client.patch(review_url, data={'text': 'новый текст'})
+        changes = self.sync(client, since)['results']
+        assert {(c['model'], c['id'], c['action']) for c in changes} == {
+            ('review', reviews[0]['id'], 'updated'),
+            ('title', title_id, 'updated'),
+        }, 'Проверьте, что курсор `since` отдаёт только новые изменения.'
+        assert [
+            c['data']['text'] for c in changes if c['model'] == 'review'
+        ] == ['новый текст']
+
+        since = self.sync(client, since)['next']
+        admin_client.delete(review_url)
+        changes = self.sync(client, since)['results']
+        deleted = {
+            (c['model'], c['id']) for c in changes if c['action'] == 'deleted'
+        }
+        assert ('review', reviews[0]['id']) in deleted
+        assert {('comment', c['id']) for c in comments} <= deleted, (
+            'Проверьте, что каскадное удаление попадает в журнал.'
+        )
+        assert all(
+            c['data'] is None for c in changes if c['action'] == 'deleted'
+        )
+
+    def test_02_paging(self, client, admin_client, admin, user_client, user):
+        create_comments(admin_client, {admin: admin_client, user: user_client})
+        full = self.sync(client)['results']
+        since, synced = 0, []
+        while True:
+            data = self.sync(client, since, limit=3)
+            synced += data['results']
+            since = data['next']
+            if not data['has_more']:
+                break
+        assert {(c['model'], c['id']) for c in synced} == {
+            (c['model'], c['id']) for c in full
+        }
+        response = client.get(f'{self.url}?since=abc')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_admin_read_only(self, django_user_model):
+        request = RequestFactory().get('/admin/')
+        request.user = django_user_model.objects.create_superuser(
+            username='superuser', email='superuser@yamdb.fake',
+            password='1234567'
+        )
+        model_admin = admin.site._registry[ChangeLog]
+        assert model_admin.has_view_permission(request)
+        assert not any((
+            model_admin.has_add_permission(request),
+            model_admin.has_change_permission(request),
+            model_admin.has_delete_permission(request),
+        )), (
+            'Проверьте, что записи журнала изменений нельзя добавлять, '
+            'изменять и удалять в админке.'
+        )
+
+    def test_04_username_changes(self, client, admin_client, admin,
+                                 user_client, user):
+        comments, reviews, _ = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        review_ids = {
+            r['id'] for r in reviews if r['author'] == user.username
+        }
+        comment_ids = {
+            c['id'] for c in comments if c['author'] == user.username
+        }
+        since = self.sync(client)['next']
+        user.username = 'renamed'
+        user.save()
+        changes = self.sync(client, since)['results']
+        assert review_ids and comment_ids
+        assert {(c['model'], c['id']) for c in changes} == {
+            *(('review', pk) for pk in review_ids),
+            *(('comment', pk) for pk in comment_ids),
+        }, (
+            'Проверьте, что смена логина попадает в журнал изменений '
+            'отзывов и комментариев пользователя.'
+        )
+        assert {c['data']['author'] for c in changes} == {'renamed'}
+
+    def test_05_soft_delete_logged_once(self, client, admin_client, admin,
+                                        user_client, user, eager_jobs):
+        comments, reviews, _ = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        since = self.sync(client)['next']
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        deleted = [
+            (entry.model, entry.object_id) for entry in
+            ChangeLog.objects.filter(id__gt=since, action=ChangeLog.DELETED)
+        ]
+        expected = [
+            *(('review', r['id']) for r in reviews
+              if r['author'] == user.username),
+            *(('comment', c['id']) for c in comments
+              if c['author'] == user.username),
+        ]
+        assert sorted(deleted) == sorted(expected), (
+            'Проверьте, что скрытые и затем удалённые отзывы и комментарии '
+            'попадают в журнал один раз.'
+        )
@@ -0,0 +1,133 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import sync_to_async
+
+from api.events import EventStreamApp, broker
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+TIMEOUT = 5
+
+
+async def not_found_app(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 404,
+                'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+class StreamClient:
+    """Клиент ASGI-приложения, читающий поток событий по частям."""
+
+    def __init__(self, app, path):
+        self.app = app
+        self.path = path
+        self.requests = asyncio.Queue()
+        self.messages = asyncio.Queue()
+
+    async def __aenter__(self):
+        scope = {'type': 'http', 'method': 'GET', 'path': self.path,
+                 'query_string': b'', 'headers': []}
+        await self.requests.put({'type': 'http.request', 'body': b''})
+        self.task = asyncio.ensure_future(
+            self.app(scope, self.requests.get, self.messages.put)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.requests.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(self.task, TIMEOUT)
+
+    async def receive(self):
+        return await asyncio.wait_for(self.messages.get(), TIMEOUT)
+
+    async def receive_event(self):
+        while True:
+            body = (await self.receive())['body'].decode()
+            if not body.startswith(':'):
+                break
+        fields = dict(
+            line.split(': ', 1) for line in body.strip().split('\n')
+        )
+        fields['data'] = json.loads(fields['data'])
+        return fields
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Events:
+
+    def test_01_stream(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        app = EventStreamApp(not_found_app)
+
+        async def scenario():
+            path = f'/api/v1/titles/{title_id}/events/'
+            async with StreamClient(app, path) as stream:
+                start = await stream.receive()
+                assert start['status'] == 200
+                assert (b'content-type',
+                        b'text/event-stream; charset=utf-8') in (
+                    start['headers']
+                ), 'Проверьте, что поток отдаётся как `text/event-stream`.'
+                await stream.receive()
+
+                review = (await sync_to_async(create_single_review)(
+                    user_client, title_id, 'новый отзыв', 7
+                )).json()
+                event = await stream.receive_event()
+                assert event['event'] == 'review'
+                assert event['id'] == f'review:{review["id"]}'
+                assert event['data']['text'] == 'новый отзыв', (
+                    'Проверьте, что новый отзыв публикуется в поток '
+                    'произведения.'
+                )
+
+                comment = (await sync_to_async(create_single_comment)(
+                    admin_client, title_id, review['id'], 'комментарий'
+                )).json()
+                event = await stream.receive_event()
+                assert event['event'] == 'comment'
+                assert event['data']['id'] == comment['id']
+                assert event['data']['review'] == review['id'], (
+                    'Проверьте, что новый комментарий публикуется в поток '
+                    'произведения.'
+                )
+
+                await sync_to_async(create_single_review)(
+                    user_client, titles[1]['id'], 'другой отзыв', 5
+                )
+                await asyncio.sleep(0)
+                assert stream.messages.empty(), (
+                    'Проверьте, что в поток не попадают события других '
+                    'произведений.'
+                )
+            assert not broker.has_subscribers(title_id), (
+                'Проверьте, что подписка снимается после отключения клиента.'
+            )
+
+        asyncio.run(scenario())
+
+    def test_02_routing(self, admin_client):
+        app = EventStreamApp(not_found_app)
+
+        async def request(path):
+            messages = asyncio.Queue()
+            scope = {'type': 'http', 'method': 'GET', 'path': path,
+                     'query_string': b'', 'headers': []}
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            await app(scope, receive, messages.put)
+            return await messages.get()
+
+        assert asyncio.run(request('/api/v1/titles/999/events/'))[
+            'status'] == 404, (
+            'Проверьте, что поток несуществующего произведения возвращает '
+            '404.'
+        )
+        assert asyncio.run(request('/api/v1/titles/'))['status'] == 404, (
+            'Проверьте, что остальные запросы передаются приложению Django.'
+        )
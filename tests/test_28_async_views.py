@@ -0,0 +1,125 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.urls import resolve
+
+from api_yamdb.asgi import application
+from tests.utils import create_reviews
+
+TIMEOUT = 10
+
+
+async def asgi_request(method, path, query='', headers=(), body=b''):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': method, 'scheme': 'http', 'path': path,
+        'raw_path': path.encode(), 'query_string': query.encode(),
+        'root_path': '', 'server': ('testserver', 80),
+        'client': ('127.0.0.1', 12345),
+        'headers': [(b'host', b'testserver'),
+                    (b'content-length', str(len(body)).encode()), *headers],
+    }
+    messages = [{'type': 'http.request', 'body': body}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(TIMEOUT)
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await asyncio.wait_for(application(scope, receive, send), TIMEOUT)
+    status = sent[0]['status']
+    content = b''.join(message.get('body', b'') for message in sent[1:])
+    return status, json.loads(content) if content else None
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28AsyncViews:
+
+    def test_01_async_reads(self, admin_client, admin, user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        urls = [
+            ('/api/v1/titles/', ''),
+            (f'/api/v1/titles/{title_id}/', ''),
+            (f'/api/v1/titles/{title_id}/reviews/', ''),
+            (f'/api/v1/titles/{title_id}/reviews/', 'pagination=cursor'),
+            (f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+             'comments/', ''),
+        ]
+        for path, _ in urls:
+            func = resolve(path).func
+            assert not iscoroutinefunction(func), (
+                'Проверьте, что под WSGI используется синхронное '
+                'представление.'
+            )
+            assert iscoroutinefunction(func.async_view), (
+                f'Проверьте, что у представления `{path}` есть асинхронный '
+                'вариант.'
+            )
+
+        async def scenario():
+            return await asyncio.gather(*(
+                asgi_request('GET', path, query) for path, query in urls * 4
+            ))
+
+        responses = asyncio.run(scenario())
+        for (path, query), (status, data) in zip(urls * 4, responses):
+            assert status == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{path}` через ASGI возвращает '
+                'ответ со статусом 200.'
+            )
+            url = f'{path}?{query}' if query else path
+            expected = admin_client.get(url).json()
+            # Число записей второй запрос берёт из кеша.
+            data.pop('count_cached', None)
+            expected.pop('count_cached', None)
+            assert data == expected, (
+                f'Проверьте, что ответ `{path}` через ASGI совпадает с '
+                'ответом синхронного представления.'
+            )
+
+    def test_02_async_writes(self, admin_client, admin, user, token_user):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        path = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        headers = [(b'content-type', b'application/json')]
+        body = json.dumps({'text': 'отзыв', 'score': 5}).encode()
+
+        status, _ = asyncio.run(asgi_request('POST', path, headers=headers,
+                                             body=body))
+        assert status == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что права доступа проверяются и через ASGI.'
+        )
+
+        headers.append(
+            (b'authorization', f'Bearer {token_user["access"]}'.encode())
+        )
+        status, data = asyncio.run(asgi_request('POST', path, headers=headers,
+                                                body=body))
+        assert status == HTTPStatus.CREATED, (
+            'Проверьте, что запись через ASGI выполняется.'
+        )
+        assert data['author'] == user.username
+
+    def test_03_async_not_modified(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        for path in ('/api/v1/titles/',
+                     f'/api/v1/titles/{titles[0]["id"]}/reviews/'):
+            etag = client.get(path)['ETag']
+            status, data = asyncio.run(asgi_request(
+                'GET', path, headers=[(b'if-none-match', etag.encode())]
+            ))
+            assert status == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{path}` через ASGI с '
+                'актуальным `If-None-Match` возвращает ответ 304.'
+            )
+            assert data is None
@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from jobs import queue
+from jobs.models import Job
+from jobs.tasks import task
+from reviews.models import TitleRating
+from tests.utils import create_single_review, create_titles
+
+calls = []
+
+
+@task(max_attempts=2)
+def flaky(fail):
+    calls.append(fail)
+    if fail:
+        raise ValueError('ошибка задачи')
+
+
+@pytest.fixture
+def queued_jobs(settings):
+    settings.JOBS_EAGER = False
+    calls.clear()
+
+
+def run_worker():
+    call_command('run_worker', '--burst')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Jobs:
+
+    def test_01_deferred_mail(self, client, queued_jobs):
+        data = {'username': 'new-user', 'email': 'new-user@yamdb.fake'}
+        client.post('/api/v1/auth/signup/', data=data)
+        client.post('/api/v1/auth/signup/', data=data)
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что письмо с кодом подтверждения отправляется '
+            'отложенной задачей.'
+        )
+        assert Job.objects.filter(status=Job.PENDING).count() == 1, (
+            'Проверьте, что повторная регистрация не создаёт вторую '
+            'ожидающую задачу с тем же ключом.'
+        )
+        run_worker()
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [data['email']]
+        assert not Job.objects.exists(), (
+            'Проверьте, что выполненные задачи удаляются из очереди.'
+        )
+
+    def test_02_deferred_rating(self, admin_client, admin, user_client,
+                                queued_jobs):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'отзыв', 8)
+        TitleRating.objects.update(weighted_rating=0)
+        create_single_review(user_client, title_id, 'отзыв', 4)
+        rating = TitleRating.objects.get(title_id=title_id)
+        assert (rating.votes, rating.score_sum, rating.histogram['4']) == (
+            2, 12, 1
+        ), (
+            'Проверьте, что счётчики оценок меняются в транзакции отзыва, '
+            'без обработчика очереди.'
+        )
+        assert rating.weighted_rating == 0
+        assert Job.objects.count() == 1
+        run_worker()
+        rating.refresh_from_db()
+        assert rating.weighted_rating == TitleRating.objects.weighted(
+            2, 12, TitleRating.objects.prior_mean()
+        ), (
+            'Проверьте, что взвешенный рейтинг пересчитывается отложенной '
+            'задачей.'
+        )
+
+    def test_03_retries(self, queued_jobs):
+        job = flaky.enqueue(fail=True)
+        run_worker()
+        job.refresh_from_db()
+        assert job.status == Job.PENDING
+        assert job.attempts == 1
+        assert job.run_at > timezone.now(), (
+            'Проверьте, что повтор задачи откладывается.'
+        )
+        assert 'ошибка задачи' in job.last_error
+
+        run_worker()
+        assert calls == [True], (
+            'Проверьте, что задача не повторяется до истечения задержки.'
+        )
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run_worker()
+        job.refresh_from_db()
+        assert job.status == Job.FAILED, (
+            'Проверьте, что после `max_attempts` попыток задача получает '
+            'статус `failed`.'
+        )
+        assert calls == [True, True]
+
+    def test_04_retry_delay(self, settings):
+        settings.JOBS_RETRY_DELAY = 10
+        settings.JOBS_MAX_RETRY_DELAY = 60
+        assert [queue.retry_delay(attempt).seconds
+                for attempt in range(1, 5)] == [10, 20, 40, 60], (
+            'Проверьте, что задержка повтора растёт экспоненциально до '
+            '`JOBS_MAX_RETRY_DELAY`.'
+        )
+
+    def test_05_stale_jobs(self, settings, queued_jobs):
+        job = flaky.enqueue(fail=False)
+        assert queue.claim('worker-1').pk == job.pk
+        assert queue.claim('worker-2') is None, (
+            'Проверьте, что задачу захватывает только один обработчик.'
+        )
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(
+                seconds=settings.JOBS_LOCK_TIMEOUT + 1
+            )
+        )
+        queue.release_stale('worker-2')
+        job.refresh_from_db()
+        assert job.status == Job.PENDING, (
+            'Проверьте, что задача зависшего обработчика возвращается в '
+            'очередь.'
+        )
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run_worker()
+        assert calls == [False]
+        assert not Job.objects.exists()
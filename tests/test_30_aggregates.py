@@ -0,0 +1,112 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from jobs.models import Job
+from reviews import aggregates
+from reviews.models import Review, Title, TitleRating
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+def check_aggregates(*args):
+    out = StringIO()
+    call_command('check_aggregates', *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30Aggregates:
+
+    def create_activity(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = (title['id'] for title in titles)
+        create_single_review(admin_client, first, 'отзыв', 9)
+        create_single_review(user_client, first, 'отзыв', 1)
+        review = create_single_review(
+            admin_client, second, 'отзыв', 6
+        ).json()
+        create_single_comment(user_client, second, review['id'], 'текст')
+        return first, second, review['id']
+
+    def test_01_user_delete(self, settings, admin_client, user_client,
+                            user):
+        first, second, review_id = self.create_activity(
+            admin_client, user_client
+        )
+        assert check_aggregates() == 'Расхождений не найдено\n'
+
+        settings.JOBS_EAGER = False
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert list(
+            Job.objects.filter(name='reviews.tasks.recompute_titles')
+            .values_list('kwargs', flat=True)
+        ) == [{'title_ids': [first, second]}], (
+            'Проверьте, что удаление пользователя ставит одну задачу '
+            'пересчёта затронутых произведений вместо пересчёта по строкам.'
+        )
+        with pytest.raises(CommandError):
+            check_aggregates()
+
+        call_command('run_worker', '--burst', stdout=StringIO())
+        assert check_aggregates() == 'Расхождений не найдено\n', (
+            'Проверьте, что задача пересчитывает агрегаты произведений.'
+        )
+        rating = TitleRating.objects.get(title_id=first)
+        assert (rating.votes, rating.score_sum) == (1, 9)
+        title = admin_client.get(f'/api/v1/titles/{first}/').json()
+        assert title['reviews_count'] == 1
+        reviews = admin_client.get(
+            f'/api/v1/titles/{second}/reviews/'
+        ).json()['results']
+        assert reviews[0]['comments_count'] == 0, (
+            'Проверьте, что после пересчёта списки отдают новые счётчики.'
+        )
+
+    def test_02_chunks(self, settings, admin_client, user_client, user,
+                       monkeypatch):
+        first, second, _ = self.create_activity(admin_client, user_client)
+        settings.JOBS_EAGER = False
+        monkeypatch.setattr(aggregates, 'RECOMPUTE_CHUNK', 1)
+        user.delete()
+        assert sorted(
+            kwargs['title_ids'] for kwargs in
+            Job.objects.filter(name='reviews.tasks.recompute_titles')
+            .values_list('kwargs', flat=True)
+        ) == [[first], [second]], (
+            'Проверьте, что произведения пересчитываются частями по '
+            '`RECOMPUTE_CHUNK`.'
+        )
+
+    def test_03_title_delete(self, settings, admin_client, user_client):
+        first, _, _ = self.create_activity(admin_client, user_client)
+        settings.JOBS_EAGER = False
+        Title.objects.filter(pk=first).delete()
+        assert not Job.objects.filter(
+            name='reviews.tasks.recompute_titles'
+        ).exists(), (
+            'Проверьте, что удаление произведения не ставит задач '
+            'пересчёта его отзывов.'
+        )
+        assert check_aggregates() == 'Расхождений не найдено\n'
+
+    def test_04_check_and_fix(self, admin_client, user_client):
+        first, second, review_id = self.create_activity(
+            admin_client, user_client
+        )
+        Title.objects.filter(pk=first).update(reviews_count=10)
+        Review.objects.filter(pk=review_id).update(comments_count=5)
+        TitleRating.objects.filter(title_id=second).update(votes=3)
+        with pytest.raises(CommandError) as error:
+            check_aggregates()
+        assert '2' in str(error.value), (
+            'Проверьте, что команда сообщает число произведений с '
+            'расхождениями.'
+        )
+        check_aggregates('--fix')
+        assert check_aggregates() == 'Расхождений не найдено\n', (
+            'Проверьте, что `check_aggregates --fix` пересчитывает агрегаты.'
+        )
+        assert Title.objects.get(pk=first).reviews_count == 2
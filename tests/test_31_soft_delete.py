@@ -0,0 +1,137 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from jobs.models import Job
+from reviews import deletion
+from reviews.models import Review, ReviewComment, Title
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+from users.models import User
+
+
+def run_worker():
+    call_command('run_worker', '--burst', stdout=StringIO())
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31SoftDelete:
+
+    def test_01_title(self, settings, client, admin_client, user_client):
+        titles, _, genres = create_titles(admin_client)
+        first, second = (title['id'] for title in titles)
+        review = create_single_review(user_client, first, 'отзыв', 7).json()
+        create_single_comment(admin_client, first, review['id'], 'текст')
+
+        settings.JOBS_EAGER = False
+        response = admin_client.delete(f'/api/v1/titles/{first}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        for url in (f'/api/v1/titles/{first}/',
+                    f'/api/v1/titles/{first}/reviews/',
+                    f'/api/v1/titles/{first}/reviews/{review["id"]}/'):
+            assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что удалённое произведение и его отзывы скрыты '
+                'сразу после удаления.'
+            )
+        data = client.get('/api/v1/titles/').json()
+        assert [title['id'] for title in data['results']] == [second]
+        data = client.get(
+            f'/api/v1/titles/?genre={genres[0]["slug"]}'
+        ).json()
+        assert data['results'] == [], (
+            'Проверьте, что фасеты не находят удалённое произведение.'
+        )
+        assert Title._base_manager.filter(pk=first).exists(), (
+            'Проверьте, что строки произведения удаляются фоновой задачей.'
+        )
+        assert Job.objects.filter(name='reviews.tasks.purge_title').exists()
+        changes = client.get('/api/v1/changes/').json()['results']
+        assert {
+            change['action'] for change in changes
+            if (change['model'], change['id']) == ('title', first)
+        } == {'deleted'}
+
+        run_worker()
+        assert not Title._base_manager.filter(pk=first).exists()
+        assert not Review._base_manager.filter(title_id=first).exists()
+        assert not ReviewComment._base_manager.exists(), (
+            'Проверьте, что задача удаляет отзывы и комментарии произведения.'
+        )
+
+    def test_02_user(self, settings, client, admin_client, user_client,
+                     user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'отзыв', 9)
+        review = create_single_review(user_client, title_id, 'отзыв', 1)
+        review = review.json()
+
+        settings.JOBS_EAGER = False
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(
+            f'/api/v1/titles/{title_id}/reviews/{review["id"]}/'
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что отзывы удалённого пользователя скрыты.'
+        )
+        title = client.get(f'/api/v1/titles/{title_id}/').json()
+        assert title['rating'] == 9, (
+            'Проверьте, что оценки удалённого пользователя не входят в '
+            'рейтинг.'
+        )
+        data = {'username': user.username, 'email': user.email}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что логин и почта удалённого пользователя снова '
+            'свободны.'
+        )
+
+        run_worker()
+        assert not User._base_manager.filter(pk=user.pk).exists()
+        assert not Review._base_manager.filter(pk=review['id']).exists()
+        title = client.get(f'/api/v1/titles/{title_id}/').json()
+        assert title['reviews_count'] == 1
+
+    def test_03_batches(self, settings, admin_client, admin, user_client,
+                        user, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        for client in (admin_client, user_client):
+            create_single_review(client, title_id, 'отзыв', 5)
+        settings.JOBS_EAGER = False
+        Title.objects.filter(pk=title_id).delete()
+        monkeypatch.setattr(deletion, 'PURGE_BATCH', 1)
+        with CaptureQueriesContext(connection) as queries:
+            run_worker()
+        deletes = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('DELETE FROM "reviews_review"')
+        ]
+        assert len(deletes) == 2, (
+            'Проверьте, что отзывы удаляются частями по `PURGE_BATCH`.'
+        )
+
+    def test_04_nested_routes(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(user_client, title_id, 'отзыв', 7).json()
+        create_single_comment(admin_client, title_id, review['id'], 'текст')
+        for url, table, parent in (
+                (f'/api/v1/titles/{title_id}/reviews/', 'reviews_review',
+                 '"reviews_title"'),
+                (f'/api/v1/titles/{title_id}/reviews/{review["id"]}/'
+                 'comments/', 'reviews_reviewcomment', '"reviews_review"')):
+            with CaptureQueriesContext(connection) as queries:
+                assert client.get(url).status_code == HTTPStatus.OK
+            rows = [
+                query['sql'] for query in queries.captured_queries
+                if f'FROM "{table}"' in query['sql']
+            ]
+            assert rows and not any(f'JOIN {parent}' in sql for sql in rows), (
+                f'Проверьте, что список `{url}` не соединяется с уже '
+                'найденным родителем.'
+            )